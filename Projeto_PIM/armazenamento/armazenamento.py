@@ -0,0 +1,560 @@
+import gc
+import json
+import marshal
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos
+    fcntl = None
+
+
+# ========== CONFIGURAÇÕES ==========
+ARQUIVO_JSON = "dados_usuarios.json"
+ARQUIVO_JOURNAL = "dados_usuarios.journal"
+ARQUIVO_CURSOS = "cursos.json"
+ARQUIVO_SQLITE = "plataforma.db"
+BACKEND = os.environ.get("PIM_BACKEND", "json")  # "json" ou "sqlite"
+USAR_SNAPSHOT_BINARIO = os.environ.get("PIM_SNAPSHOT_BINARIO", "1") == "1"
+# Só o índice fica em memória; no Windows o mmap impediria o os.replace do snapshot
+CARGA_SOB_DEMANDA = (USAR_SNAPSHOT_BINARIO and os.name == "posix"
+                     and os.environ.get("PIM_CARGA_SOB_DEMANDA", "1") == "1")
+LIMITE_JOURNAL = 512 * 1024  # Bytes no journal antes de compactar no snapshot
+LIMITE_NOMES_JOURNAL = 1000  # Lotes maiores (ex.: importação) vão direto para o snapshot
+COR_SUCESSO = "\033[1;32m"
+COR_ERRO = "\033[1;31m"
+RESET_COR = "\033[0m"
+
+
+# ========== TRAVAS E GRAVAÇÃO ATÔMICA ==========
+@contextmanager
+def trava_arquivo(arquivo: str, compartilhada: bool = False):
+    """Trava consultiva (fcntl) em '<arquivo>.lock' entre processos"""
+    if fcntl is None:
+        yield
+        return
+    with open(arquivo + ".lock", 'a') as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_SH if compartilhada else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+def _gravar_json_atomico(arquivo: str, dados: Dict):
+    """Grava em arquivo temporário e troca com os.replace (nunca deixa o JSON pela metade)"""
+    pasta = os.path.dirname(os.path.abspath(arquivo))
+    fd, temporario = tempfile.mkstemp(dir=pasta, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(dados, f, indent=4, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, arquivo)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+
+# ========== SNAPSHOT BINÁRIO ==========
+# Layout: cabeçalho | tamanho do índice | índice (chaves + offsets) | registros em marshal
+CABECALHO_BINARIO = struct.Struct("<4sBBBQ")  # magic, formato, python major/minor, tamanho do índice
+MAGIC_BINARIO = b"PIMB"
+VERSAO_FORMATO_BINARIO = 1
+
+def arquivo_binario(arquivo_json: str) -> str:
+    return os.path.splitext(arquivo_json)[0] + ".bin"
+
+def gravar_snapshot_binario(arquivo: str, dados: Dict):
+    """Grava os registros com marshal, um por um, precedidos de um índice chave -> offset"""
+    chaves = list(dados)
+    offsets = array("Q", [0])
+    registros = []
+    for chave in chaves:
+        registro = marshal.dumps(dados[chave])
+        registros.append(registro)
+        offsets.append(offsets[-1] + len(registro))
+    indice = marshal.dumps((chaves, offsets.tobytes()))
+
+    pasta = os.path.dirname(os.path.abspath(arquivo))
+    fd, temporario = tempfile.mkstemp(dir=pasta, prefix=".tmp-", suffix=".bin")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(CABECALHO_BINARIO.pack(MAGIC_BINARIO, VERSAO_FORMATO_BINARIO,
+                                           sys.version_info[0], sys.version_info[1], len(indice)))
+            f.write(indice)
+            f.writelines(registros)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, arquivo)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+def ler_indice_binario(conteudo) -> Optional[tuple]:
+    """Devolve (chaves, offsets, início dos registros) ou None se o arquivo não serve"""
+    if len(conteudo) < CABECALHO_BINARIO.size:
+        return None
+    magic, formato, major, minor, tamanho_indice = CABECALHO_BINARIO.unpack_from(conteudo)
+    # marshal só é garantido entre iguais versões do Python
+    if (magic != MAGIC_BINARIO or formato != VERSAO_FORMATO_BINARIO
+            or (major, minor) != sys.version_info[:2]):
+        return None
+    inicio = CABECALHO_BINARIO.size
+    chaves, bytes_offsets = marshal.loads(conteudo[inicio:inicio + tamanho_indice])
+    offsets = array("Q")
+    offsets.frombytes(bytes_offsets)
+    return chaves, offsets, inicio + tamanho_indice
+
+def ler_snapshot_binario(arquivo: str) -> Optional[Dict]:
+    """Lê o snapshot binário inteiro (None se não existe ou é incompatível)"""
+    try:
+        with open(arquivo, 'rb') as f:
+            conteudo = memoryview(f.read())
+    except FileNotFoundError:
+        return None
+    indice = ler_indice_binario(conteudo)
+    if indice is None:
+        return None
+    chaves, offsets, base = indice
+    loads = marshal.loads
+    # Os registros não têm ciclos: o coletor só gastaria tempo varrendo milhões de objetos novos
+    coletor_ativo = gc.isenabled()
+    gc.disable()
+    try:
+        return {chave: loads(conteudo[base + offsets[i]:base + offsets[i + 1]])
+                for i, chave in enumerate(chaves)}
+    finally:
+        if coletor_ativo:
+            gc.enable()
+
+def _binario_atual(arquivo_json: str) -> bool:
+    """True se o snapshot binário existe e é mais novo que o JSON"""
+    if not USAR_SNAPSHOT_BINARIO:
+        return False
+    try:
+        return os.stat(arquivo_binario(arquivo_json)).st_mtime_ns >= os.stat(arquivo_json).st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+def _ler_dados(arquivo_json: str) -> Dict:
+    """Lê o snapshot binário quando ele é mais novo que o JSON; senão o JSON"""
+    if _binario_atual(arquivo_json):
+        dados = ler_snapshot_binario(arquivo_binario(arquivo_json))
+        if dados is not None:
+            return dados
+    with open(arquivo_json, 'r') as f:
+        return json.load(f)
+
+def _gravar_dados(arquivo_json: str, dados: Dict):
+    """Grava o JSON e, depois dele, o snapshot binário (que fica mais novo)"""
+    if not isinstance(dados, dict):
+        dados = dict(dados.items())  # json/marshal precisam de um dict de verdade
+    _gravar_json_atomico(arquivo_json, dados)
+    if USAR_SNAPSHOT_BINARIO:
+        gravar_snapshot_binario(arquivo_binario(arquivo_json), dados)
+
+
+# ========== CARGA SOB DEMANDA ==========
+class UsuariosSobDemanda(MutableMapping):
+    """Dict de usuários que só mantém em memória o índice do snapshot binário.
+
+    Cada registro é lido do arquivo mapeado (mmap) no primeiro acesso e fica
+    guardado junto com os registros alterados, para que mudanças como
+    usuarios[nome]['cursos'].append(...) sobrevivam até o salvar_usuarios().
+    """
+
+    def __init__(self, mapa: mmap.mmap, chaves: List[str], offsets: array, base: int):
+        self._mapa = mapa
+        self._posicoes = {chave: i for i, chave in enumerate(chaves)}
+        self._offsets = offsets
+        self._base = base
+        self._carregados: Dict = {}  # Registros já lidos, alterados ou novos
+        self._removidos = set()
+
+    def _ler(self, chave: str) -> Dict:
+        i = self._posicoes[chave]
+        inicio = self._base + self._offsets[i]
+        return marshal.loads(self._mapa[inicio:self._base + self._offsets[i + 1]])
+
+    def __getitem__(self, chave: str) -> Dict:
+        if chave in self._carregados:
+            return self._carregados[chave]
+        if chave in self._removidos or chave not in self._posicoes:
+            raise KeyError(chave)
+        registro = self._carregados[chave] = self._ler(chave)
+        return registro
+
+    def __setitem__(self, chave: str, registro: Dict):
+        self._carregados[chave] = registro
+        self._removidos.discard(chave)
+
+    def __delitem__(self, chave: str):
+        if chave not in self:
+            raise KeyError(chave)
+        self._carregados.pop(chave, None)
+        if chave in self._posicoes:
+            self._removidos.add(chave)
+
+    def __contains__(self, chave) -> bool:
+        return chave in self._carregados or (chave in self._posicoes and chave not in self._removidos)
+
+    def __iter__(self):
+        for chave in self._posicoes:
+            if chave not in self._removidos:
+                yield chave
+        for chave in list(self._carregados):
+            if chave not in self._posicoes:
+                yield chave
+
+    def __len__(self) -> int:
+        novos = sum(1 for chave in self._carregados if chave not in self._posicoes)
+        return len(self._posicoes) - len(self._removidos) + novos
+
+    def consultar(self, chave: str) -> Optional[Dict]:
+        """Lê um registro sem guardá-lo (None se não existe): para listagens paginadas"""
+        if chave in self._carregados:
+            return self._carregados[chave]
+        if chave in self._removidos or chave not in self._posicoes:
+            return None
+        return self._ler(chave)
+
+    def items(self):
+        """Percorre tudo sem guardar os registros lidos (a memória não cresce numa listagem)"""
+        for chave in self:
+            yield chave, self._carregados[chave] if chave in self._carregados else self._ler(chave)
+
+    def values(self):
+        for _, registro in self.items():
+            yield registro
+
+    def clear(self):
+        self._posicoes = {}
+        self._carregados = {}
+        self._removidos = set()
+
+    def substituir(self, outro: MutableMapping):
+        """Troca todo o conteúdo pelo de outro mapeamento (usado ao recarregar)"""
+        if isinstance(outro, UsuariosSobDemanda):
+            self.__dict__.update(outro.__dict__)
+        else:
+            self.clear()
+            self._carregados = dict(outro)
+
+def abrir_usuarios_sob_demanda(arquivo: str) -> Optional[UsuariosSobDemanda]:
+    """Mapeia o snapshot binário e lê só o índice (None se não existe ou é incompatível)"""
+    try:
+        with open(arquivo, 'rb') as f:
+            mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):  # ValueError: arquivo vazio
+        return None
+    indice = ler_indice_binario(mapa)
+    if indice is None:
+        mapa.close()
+        return None
+    return UsuariosSobDemanda(mapa, *indice)
+
+
+# ========== BACKEND JSON ==========
+class RepositorioJSON:
+    """Usuários em snapshot JSON + journal de alterações; cursos em JSON único"""
+
+    def __init__(self, arquivo_usuarios: str = ARQUIVO_JSON,
+                 arquivo_journal: str = ARQUIVO_JOURNAL,
+                 arquivo_cursos: str = ARQUIVO_CURSOS):
+        self.arquivo_usuarios = arquivo_usuarios
+        self.arquivo_journal = arquivo_journal
+        self.arquivo_cursos = arquivo_cursos
+
+    # ----- Usuários -----
+    def carregar_usuarios(self) -> Optional[Dict]:
+        """Lê o snapshot e reaplica o journal (None se ainda não há dados)"""
+        with trava_arquivo(self.arquivo_usuarios, compartilhada=True):
+            return self._ler_usuarios_disco()
+
+    def salvar_usuarios(self, usuarios: Dict, nomes: Iterable[str] = ()) -> tuple:
+        """Anexa ao journal só os registros alterados.
+
+        Sem nomes, todos os usuários em memória são sobrepostos ao estado do disco
+        (relido sob a trava): o que outros processos gravaram para outros nomes fica.
+        Retorna as assinaturas de antes e depois da gravação, lidas sob a trava.
+        """
+        nomes = list(nomes)
+        with trava_arquivo(self.arquivo_usuarios):
+            antes = self.assinatura_usuarios()
+            if not nomes:
+                self._compactar(usuarios, list(usuarios))
+            elif (not os.path.exists(self.arquivo_usuarios)
+                    or len(nomes) > LIMITE_NOMES_JOURNAL
+                    or self._tamanho_journal() > LIMITE_JOURNAL):
+                self._compactar(usuarios, nomes)
+            else:
+                self._anexar_journal(usuarios, nomes)
+            return antes, self.assinatura_usuarios()
+
+    def assinatura_usuarios(self) -> tuple:
+        """mtime/tamanho do snapshot e do journal: muda sempre que alguém grava"""
+        assinatura = []
+        for arquivo in (self.arquivo_usuarios, self.arquivo_journal):
+            try:
+                info = os.stat(arquivo)
+                assinatura.append((info.st_mtime_ns, info.st_size))
+            except FileNotFoundError:
+                assinatura.append(None)
+        return tuple(assinatura)
+
+    def compactar_usuarios(self, usuarios: Dict):
+        """Consolida snapshot + journal do disco num snapshot novo"""
+        with trava_arquivo(self.arquivo_usuarios):
+            self._compactar(usuarios, ())
+
+    def _ler_usuarios_disco(self) -> Optional[Dict]:
+        if not os.path.exists(self.arquivo_usuarios):
+            return None
+        usuarios = None
+        if CARGA_SOB_DEMANDA and _binario_atual(self.arquivo_usuarios):
+            usuarios = abrir_usuarios_sob_demanda(arquivo_binario(self.arquivo_usuarios))
+        if usuarios is None:
+            usuarios = _ler_dados(self.arquivo_usuarios)
+        self._aplicar_journal(usuarios)
+        return usuarios
+
+    def _compactar(self, usuarios: Dict, nomes: Iterable[str]):
+        """Parte do estado em disco (com o que outros processos gravaram) e sobrepõe os nomes alterados"""
+        base = self._ler_usuarios_disco()
+        if base is None:
+            base = usuarios
+        for nome in nomes:
+            if nome in usuarios:
+                base[nome] = usuarios[nome]
+            else:
+                base.pop(nome, None)
+        self._gravar_snapshot(base)
+
+    def _gravar_snapshot(self, usuarios: Dict):
+        _gravar_dados(self.arquivo_usuarios, usuarios)
+        # Se cair antes de remover o journal, reaplicá-lo sobre o snapshot novo não muda nada
+        if os.path.exists(self.arquivo_journal):
+            os.remove(self.arquivo_journal)
+
+    def _reparar_journal(self):
+        """Corta uma última linha sem quebra de linha (escrita interrompida por queda).
+
+        Sem isso a próxima entrada seria colada nela e as duas se perderiam juntas.
+        Chamado sob a trava, antes de anexar; o journal é limitado por LIMITE_JOURNAL.
+        """
+        try:
+            with open(self.arquivo_journal, 'r+b') as f:
+                conteudo = f.read()
+                if not conteudo or conteudo.endswith(b"\n"):
+                    return
+                f.truncate(conteudo.rfind(b"\n") + 1)
+                f.flush()
+                os.fsync(f.fileno())
+        except FileNotFoundError:
+            pass
+
+    def _anexar_journal(self, usuarios: Dict, nomes: Iterable[str]):
+        self._reparar_journal()
+        with open(self.arquivo_journal, 'a', encoding='utf-8') as f:
+            for nome in nomes:
+                if nome in usuarios:
+                    entrada = {"op": "set", "nome": nome, "dados": usuarios[nome]}
+                else:
+                    entrada = {"op": "del", "nome": nome}
+                f.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _tamanho_journal(self) -> int:
+        try:
+            return os.path.getsize(self.arquivo_journal)
+        except FileNotFoundError:
+            return 0
+
+    def _aplicar_journal(self, usuarios: Dict) -> int:
+        """Reaplica sobre o snapshot as alterações gravadas no journal"""
+        if not os.path.exists(self.arquivo_journal):
+            return 0
+
+        total = 0
+        with open(self.arquivo_journal, 'r', encoding='utf-8') as f:
+            for linha in f:
+                try:
+                    entrada = json.loads(linha)
+                except json.JSONDecodeError:
+                    continue  # Linha truncada por queda no meio da escrita
+                if entrada["op"] == "set":
+                    usuarios[entrada["nome"]] = entrada["dados"]
+                else:
+                    usuarios.pop(entrada["nome"], None)
+                total += 1
+        return total
+
+    # ----- Cursos -----
+    def carregar_cursos(self) -> Optional[Dict]:
+        """Lê o arquivo de cursos (None se ainda não existe)"""
+        if not os.path.exists(self.arquivo_cursos):
+            return None
+        with trava_arquivo(self.arquivo_cursos, compartilhada=True):
+            return _ler_dados(self.arquivo_cursos)
+
+    def salvar_cursos(self, cursos: Dict, ids: Iterable[str] = ()) -> List[str]:
+        """Relê o arquivo, sobrepõe os cursos alterados e grava (sem ids, grava tudo).
+
+        O dict recebido é atualizado com o que outros processos gravaram; retorna
+        os ids que mudaram por causa disso.
+        """
+        ids = list(ids)
+        externos = []
+        with trava_arquivo(self.arquivo_cursos):
+            if ids and os.path.exists(self.arquivo_cursos):
+                base = _ler_dados(self.arquivo_cursos)
+                externos = [id_curso for id_curso in base.keys() | cursos.keys()
+                            if id_curso not in ids and base.get(id_curso) != cursos.get(id_curso)]
+                for id_curso in ids:
+                    if id_curso in cursos:
+                        base[id_curso] = cursos[id_curso]
+                    else:
+                        base.pop(id_curso, None)
+                cursos.clear()
+                cursos.update(base)
+            _gravar_dados(self.arquivo_cursos, cursos)
+        return externos
+
+
+# ========== BACKEND SQLITE ==========
+# As consultas por email, perfil e curso usam os índices em memória (IndicesUsuarios),
+# então o banco guarda só as linhas: sem tabela de matrículas nem índices secundários.
+ESQUEMA_SQLITE = """
+CREATE TABLE IF NOT EXISTS usuarios (
+    nome TEXT PRIMARY KEY,
+    email TEXT,
+    is_admin INTEGER NOT NULL DEFAULT 0,
+    dados TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cursos (
+    id TEXT PRIMARY KEY,
+    dados TEXT NOT NULL
+);
+DROP INDEX IF EXISTS idx_usuarios_email;
+DROP INDEX IF EXISTS idx_usuarios_admin;
+DROP TABLE IF EXISTS matriculas;
+"""
+
+
+class RepositorioSQLite:
+    """Usuários e cursos em SQLite (WAL), gravando linha a linha"""
+
+    def __init__(self, arquivo: str = ARQUIVO_SQLITE):
+        self.arquivo = arquivo
+        self.conexao = sqlite3.connect(arquivo, timeout=30)  # Espera a trava de outros processos
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.execute("PRAGMA synchronous=NORMAL")
+        self.conexao.execute("PRAGMA foreign_keys=ON")
+        self.conexao.executescript(ESQUEMA_SQLITE)
+
+    # ----- Usuários -----
+    def carregar_usuarios(self) -> Optional[Dict]:
+        """Lê todos os usuários (None se o banco está vazio)"""
+        linhas = self.conexao.execute("SELECT nome, dados FROM usuarios").fetchall()
+        if not linhas:
+            return None
+        return {nome: json.loads(dados) for nome, dados in linhas}
+
+    def salvar_usuarios(self, usuarios: Dict, nomes: Iterable[str] = ()) -> tuple:
+        """Atualiza só as linhas alteradas (sem nomes, todas as da memória, sem apagar as demais)"""
+        nomes = list(nomes) or list(usuarios)
+        antes = self.assinatura_usuarios()
+        with self.conexao:
+            for nome in nomes:
+                if nome in usuarios:
+                    self._gravar_usuario(nome, usuarios[nome])
+                else:
+                    self.conexao.execute("DELETE FROM usuarios WHERE nome = ?", (nome,))
+        return antes, self.assinatura_usuarios()
+
+    def assinatura_usuarios(self) -> int:
+        """Contador de geração do SQLite: muda quando outra conexão grava"""
+        return self.conexao.execute("PRAGMA data_version").fetchone()[0]
+
+    def compactar_usuarios(self, usuarios: Dict):
+        """Transfere o WAL para o arquivo principal do banco"""
+        self.conexao.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def _gravar_usuario(self, nome: str, dados: Dict):
+        self.conexao.execute(
+            "INSERT INTO usuarios (nome, email, is_admin, dados) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(nome) DO UPDATE SET email = excluded.email, "
+            "is_admin = excluded.is_admin, dados = excluded.dados",
+            (nome, dados.get("email"), int(bool(dados.get("is_admin"))),
+             json.dumps(dados, ensure_ascii=False))
+        )
+
+    # ----- Cursos -----
+    def carregar_cursos(self) -> Optional[Dict]:
+        """Lê todos os cursos (None se o banco está vazio)"""
+        linhas = self.conexao.execute("SELECT id, dados FROM cursos").fetchall()
+        if not linhas:
+            return None
+        return {id_curso: json.loads(dados) for id_curso, dados in linhas}
+
+    def salvar_cursos(self, cursos: Dict, ids: Iterable[str] = ()) -> List[str]:
+        """Atualiza só os cursos alterados (sem ids, regrava a tabela)"""
+        ids = list(ids)
+        with self.conexao:
+            if not ids:
+                self.conexao.execute("DELETE FROM cursos")
+                ids = list(cursos)
+            for id_curso in ids:
+                if id_curso in cursos:
+                    self.conexao.execute(
+                        "INSERT OR REPLACE INTO cursos (id, dados) VALUES (?, ?)",
+                        (id_curso, json.dumps(cursos[id_curso], ensure_ascii=False))
+                    )
+                else:
+                    self.conexao.execute("DELETE FROM cursos WHERE id = ?", (id_curso,))
+        return []  # Cada processo mantém sua cópia; nada é relido aqui
+
+
+# ========== SELEÇÃO DO BACKEND ==========
+_repositorio = None
+
+def get_repositorio():
+    """Retorna o repositório configurado em PIM_BACKEND (criado uma única vez)"""
+    global _repositorio
+    if _repositorio is None:
+        _repositorio = RepositorioSQLite() if BACKEND == "sqlite" else RepositorioJSON()
+    return _repositorio
+
+def migrar_json_para_sqlite(arquivo_sqlite: str = ARQUIVO_SQLITE):
+    """Copia usuários e cursos dos arquivos JSON atuais para o banco SQLite"""
+    origem = RepositorioJSON()
+    destino = RepositorioSQLite(arquivo_sqlite)
+
+    usuarios = origem.carregar_usuarios() or {}
+    cursos = origem.carregar_cursos() or {}
+    destino.salvar_usuarios(usuarios)
+    destino.salvar_cursos(cursos)
+    destino.compactar_usuarios(usuarios)
+
+    print(f"{COR_SUCESSO}✅ Migração concluída: {len(usuarios)} usuários e "
+          f"{len(cursos)} cursos em {arquivo_sqlite}{RESET_COR}")
+
+
+if __name__ == "__main__":
+    # Uso: python -m armazenamento.armazenamento migrar [arquivo.db]
+    if len(sys.argv) >= 2 and sys.argv[1] == "migrar":
+        migrar_json_para_sqlite(*sys.argv[2:3])
+    else:
+        print(f"{COR_ERRO}Uso: python -m armazenamento.armazenamento migrar [arquivo.db]{RESET_COR}")
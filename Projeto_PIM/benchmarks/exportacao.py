@@ -0,0 +1,92 @@
+"""Mede a vazão da exportação em fluxo a partir do snapshot binário sob demanda.
+
+Uso (de dentro de Projeto_PIM): python -m benchmarks.exportacao [1000000]
+"""
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+from itertools import islice
+
+from armazenamento.armazenamento import gravar_snapshot_binario, abrir_usuarios_sob_demanda
+from benchmarks.snapshot import gerar_usuarios, medir
+from usuarios.exportacao import exportar
+
+# Meta relativa ao hardware: o CSV deve sair a pelo menos 40% da velocidade de só
+# ler o snapshot (desserializar os registros é o custo que nenhuma exportação evita)
+META_FRACAO_LEITURA = 0.40
+LINHAS_AMOSTRA_MEMORIA = 100_000   # tracemalloc deixa tudo lento: mede o pico numa amostra
+CASOS = [
+    ("usuarios", "usuarios.csv", None),
+    ("usuarios", "usuarios.csv.gz", None),
+    ("usuarios", "usuarios.jsonl", None),
+    ("usuarios", "usuarios_email.csv", ["nome", "email"]),
+    ("matriculas", "matriculas.csv", None),
+    ("certificados", "certificados.jsonl.gz", None),
+]
+
+
+class Amostra:
+    """Primeiros N usuários, lidos em fluxo (a exportação só usa items())"""
+
+    def __init__(self, usuarios, quantidade: int):
+        self.usuarios = usuarios
+        self.quantidade = quantidade
+
+    def items(self):
+        return islice(self.usuarios.items(), self.quantidade)
+
+def preparar_snapshot(pasta: str, quantidade: int) -> str:
+    dados = gerar_usuarios(quantidade)
+    for i in range(0, quantidade, 5):  # Um em cada cinco alunos com certificado
+        dados[f"aluno_{i}"]["certificados"].append({
+            "curso": str(1 + i % 7), "codigo": f"CERT-{i:012X}",
+            "data": "2025-06-01T10:00:00", "caminho": f"certificados/CERT-{i:012X}.pdf"
+        })
+    arquivo = os.path.join(pasta, "usuarios.bin")
+    gravar_snapshot_binario(arquivo, dados)
+    del dados
+    gc.collect()
+    return arquivo
+
+def main(quantidade: int):
+    with tempfile.TemporaryDirectory() as pasta:
+        usuarios = abrir_usuarios_sob_demanda(preparar_snapshot(pasta, quantidade))
+
+        def so_ler():
+            for _ in usuarios.items():
+                pass
+
+        vazao_leitura = quantidade / medir(so_ler)
+        print(f"Leitura do snapshot: {vazao_leitura:.0f} usuários/s\n")
+
+        print(f"{'tabela':>12} | {'arquivo':>22} | {'linhas':>9} | {'tempo (s)':>9} | "
+              f"{'usuários/s':>10} | {'MB':>6}")
+        for tabela, nome, colunas in CASOS:
+            caminho = os.path.join(pasta, nome)
+            linhas = []
+            tempo = medir(lambda: linhas.append(exportar(tabela, caminho, colunas, usuarios)))
+            print(f"{tabela:>12} | {nome:>22} | {linhas[0]:>9} | {tempo:>9.2f} | "
+                  f"{quantidade / tempo:>10.0f} | {os.path.getsize(caminho) / 1e6:>6.1f}")
+            if (tabela, nome) == ("usuarios", "usuarios.csv"):
+                vazao_csv = quantidade / tempo
+
+        # O pico não deve crescer com o número de usuários: compara duas amostras
+        picos = []
+        for amostra in (LINHAS_AMOSTRA_MEMORIA // 10, LINHAS_AMOSTRA_MEMORIA):
+            tracemalloc.start()
+            exportar("usuarios", os.path.join(pasta, "amostra.csv"), None, Amostra(usuarios, amostra))
+            picos.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+    print(f"\nPico de memória da exportação: {picos[0] / 1024:.0f} KB com "
+          f"{LINHAS_AMOSTRA_MEMORIA // 10} usuários, {picos[1] / 1024:.0f} KB com {LINHAS_AMOSTRA_MEMORIA}")
+    fracao = vazao_csv / vazao_leitura
+    resultado = "OK" if fracao >= META_FRACAO_LEITURA else "ABAIXO DA META"
+    print(f"CSV: {vazao_csv:.0f} usuários/s = {fracao:.0%} da leitura "
+          f"(meta {META_FRACAO_LEITURA:.0%}) — {resultado}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
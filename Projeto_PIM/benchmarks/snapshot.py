@@ -0,0 +1,60 @@
+"""Compara o tempo de carga do JSON com o do snapshot binário.
+
+Uso (de dentro de Projeto_PIM): python -m benchmarks.snapshot [10000 100000 1000000]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+from armazenamento.armazenamento import gravar_snapshot_binario, ler_snapshot_binario
+
+
+def gerar_usuarios(quantidade: int) -> dict:
+    """Usuários sintéticos com o mesmo formato do dados_usuarios.json"""
+    return {
+        f"aluno_{i}": {
+            "senha": f"Senha@{i:07d}",
+            "email": f"aluno_{i}@escola.com",
+            "idade": 18 + i % 50,
+            "is_admin": i % 1000 == 0,
+            "data_cadastro": "2025-05-22T19:37:40.559999",
+            "cursos": [str(1 + i % 7), str(1 + i % 11)],
+            "certificados": [],
+            "modulos_concluidos": {str(1 + i % 7): ["1", "2"]},
+            "ultimo_acesso": None
+        }
+        for i in range(quantidade)
+    }
+
+def medir(funcao) -> float:
+    inicio = time.perf_counter()
+    funcao()
+    return time.perf_counter() - inicio
+
+def main(tamanhos):
+    print(f"{'usuários':>10} | {'JSON (s)':>9} | {'binário (s)':>11} | {'ganho':>6} | {'JSON MB':>8} | {'bin MB':>7}")
+    with tempfile.TemporaryDirectory() as pasta:
+        for quantidade in tamanhos:
+            dados = gerar_usuarios(quantidade)
+            arquivo_json = os.path.join(pasta, "usuarios.json")
+            arquivo_bin = os.path.join(pasta, "usuarios.bin")
+            with open(arquivo_json, 'w') as f:
+                json.dump(dados, f, indent=4, ensure_ascii=False)
+            gravar_snapshot_binario(arquivo_bin, dados)
+            del dados
+
+            def carregar_json():
+                with open(arquivo_json, 'r') as f:
+                    json.load(f)
+
+            tempo_json = medir(carregar_json)
+            tempo_bin = medir(lambda: ler_snapshot_binario(arquivo_bin))
+            print(f"{quantidade:>10} | {tempo_json:>9.3f} | {tempo_bin:>11.3f} | "
+                  f"{tempo_json / tempo_bin:>5.1f}x | "
+                  f"{os.path.getsize(arquivo_json) / 1e6:>8.1f} | {os.path.getsize(arquivo_bin) / 1e6:>7.1f}")
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
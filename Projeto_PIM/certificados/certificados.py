@@ -1,10 +1,11 @@
 # certificados.py
-from fpdf import FPDF
-import hashlib
 from datetime import datetime
-import os
-from usuarios.usuarios import usuario_logado, eh_admin, registrar_log, usuarios_cadastrados, salvar_usuarios
-from cursos.cursos import cursos_disponiveis, salvar_cursos
+from typing import Optional
+from certificados.pdf import Certificado
+from usuarios.usuarios import eh_admin, usuarios_cadastrados, salvar_usuarios
+from usuarios.usuarios import registrar_log as _registrar_log_usuarios
+from cursos.cursos import cursos_disponiveis, salvar_cursos, get_motor_progresso
+from cursos.progresso import tela_progresso_curso
 
 # ========== CONFIGURAÇÕES DE CORES ==========
 COR_TITULO = "\033[1;35m"  # Roxo
@@ -15,76 +16,31 @@ COR_ALERTA = "\033[1;33m"  # Amarelo
 COR_USUARIO = "\033[1;34m" # Azul
 RESET_COR = "\033[0m"
 
-# ========== CONFIGURAÇÕES DE PASTAS ==========
-PASTA_CERTIFICADOS = "certificados"
-os.makedirs(PASTA_CERTIFICADOS, exist_ok=True)
-
 # ========== FUNÇÕES DE ACESSO SEGURO ==========
-def get_usuario_logado():
-    """Obtém o estado ATUAL do usuário logado"""
-    from usuarios.usuarios import usuario_logado
-    return usuario_logado
+def get_usuario_logado(sessao: Optional[str] = None):
+    """Obtém o estado ATUAL do usuário logado na sessão"""
+    from usuarios.usuarios import get_usuario_logado as _get_usuario_logado
+    return _get_usuario_logado(sessao)
 
 def get_usuarios_cadastrados():
-    """Obtém os dados ATUALIZADOS dos usuários (agora com reload)"""
-    from usuarios.usuarios import carregar_usuarios  # Importa a função de carregar
-    return carregar_usuarios()  # Retorna dados frescos do JSON
+    """Obtém os dados ATUALIZADOS dos usuários (relê só se o arquivo mudou)"""
+    from usuarios.usuarios import recarregar_usuarios
+    return recarregar_usuarios()
 
 def get_cursos_disponiveis():
     """Obtém os cursos atualizados"""
     from cursos.cursos import cursos_disponiveis
     return cursos_disponiveis
 
-def registrar_log(acao: str, detalhes: str = ""):
+def registrar_log(acao: str, detalhes: str = "", alvo: Optional[str] = None, sessao: Optional[str] = None):
     """Registra log usando a função original"""
-    from usuarios.usuarios import registrar_log as original_registrar_log
-    usuario = get_usuario_logado()
-    original_registrar_log(acao, f"{detalhes} | Usuário: {usuario['nome'] if usuario else 'SISTEMA'}")
-
-# ========== CLASSE CERTIFICADO ==========
-class Certificado:
-    def __init__(self):
-        self.codigo = None
-        self.caminho = None
-
-    def gerar(self, nome_aluno: str, nome_curso: str, carga_horaria: str):
-        """Gera um certificado em PDF"""
-        self._gerar_codigo(nome_aluno, nome_curso)
-        self.caminho = f"{PASTA_CERTIFICADOS}/{self.codigo}.pdf"
-
-        pdf = FPDF()
-        pdf.add_page()
-        
-        pdf.set_font("Arial", size=24)
-        pdf.set_text_color(10, 50, 150)
-        pdf.cell(0, 40, txt="CERTIFICADO", ln=True, align='C')
-        pdf.ln(20)
-        
-        pdf.set_font("Arial", size=16)
-        pdf.set_text_color(0, 0, 0)
-        pdf.multi_cell(0, 10, 
-            f"Certificamos que {nome_aluno} concluiu com êxito o curso "
-            f"'{nome_curso}' com carga horária de {carga_horaria}.\n\n"
-            f"Data de emissão: {datetime.now().strftime('%d/%m/%Y')}\n\n"
-            f"Código de validação: {self.codigo}",
-            align='C')
-        
-        pdf.set_y(-30)
-        pdf.set_font("Arial", style='I', size=12)
-        pdf.cell(0, 10, txt="Este certificado pode ser validado em nossa plataforma", ln=True, align='C')
-        
-        pdf.output(self.caminho)
-        return self.caminho
-
-    def _gerar_codigo(self, nome_aluno: str, nome_curso: str):
-        """Cria um código único baseado em hash"""
-        base = f"{nome_aluno}{nome_curso}{datetime.now()}"
-        self.codigo = "CERT-" + hashlib.sha256(base.encode()).hexdigest()[:12].upper()
+    usuario = get_usuario_logado(sessao)
+    _registrar_log_usuarios(acao, f"{detalhes} | Usuário: {usuario['nome'] if usuario else 'SISTEMA'}", alvo, sessao)
 
 # ========== FUNÇÕES PRINCIPAIS ==========
-def tela_certificados():
+def tela_certificados(sessao: Optional[str] = None):
     """Menu principal de certificados"""
-    usuario = get_usuario_logado()
+    usuario = get_usuario_logado(sessao)
     if not usuario:
         print(f"\n{COR_ERRO}⚠️ VOCÊ PRECISA ESTAR LOGADO!{RESET_COR}")
         return
@@ -93,23 +49,28 @@ def tela_certificados():
         print(f"\n{COR_TITULO}=== MEUS CERTIFICADOS ===")
         print(f"{COR_MENU}1. 🖨️ Gerar certificado")
         print("2. 📂 Ver meus certificados")
+        if eh_admin(sessao):
+            print("3. 🏭 Emitir certificados em lote (ADM)")
         print(f"0. ↩ Voltar{RESET_COR}")
         print("="*40)
         
         escolha = input("Escolha: ")
 
         if escolha == '1':
-            gerar_certificado_menu()
+            gerar_certificado_menu(sessao)
         elif escolha == '2':
-            listar_certificados()
+            listar_certificados(sessao)
+        elif escolha == '3' and eh_admin(sessao):
+            from certificados.lote import tela_emissao_lote
+            tela_emissao_lote(sessao)
         elif escolha == '0':
             break
         else:
             print(f"{COR_ERRO}❌ Opção inválida!{RESET_COR}")
 
-def gerar_certificado_menu():
+def gerar_certificado_menu(sessao: Optional[str] = None):
     """Interface para gerar certificado"""
-    usuario = get_usuario_logado()
+    usuario = get_usuario_logado(sessao)
     if not usuario:
         print(f"{COR_ERRO}⚠️ Você precisa estar logado!{RESET_COR}")
         return
@@ -158,20 +119,20 @@ def gerar_certificado_menu():
             'caminho': caminho
         })
         
-        # Atualiza no arquivo JSON
+        # Grava só o registro do aluno
         from usuarios.usuarios import salvar_usuarios
-        salvar_usuarios()
+        salvar_usuarios(usuario['nome'])
         
-        registrar_log("Certificado emitido", f"Curso: {id_curso}")
+        registrar_log("Certificado emitido", f"Curso: {id_curso}", alvo=usuario['nome'], sessao=sessao)
         print(f"\n{COR_SUCESSO}✅ Certificado gerado com sucesso!{RESET_COR}")
         print(f"{COR_MENU}Caminho: {caminho}{RESET_COR}")
         
     except Exception as e:
         print(f"{COR_ERRO}❌ Erro ao gerar certificado: {e}{RESET_COR}")
 
-def listar_certificados():
+def listar_certificados(sessao: Optional[str] = None):
     """Lista todos os certificados do usuário"""
-    usuario = get_usuario_logado()
+    usuario = get_usuario_logado(sessao)
     if not usuario:
         print(f"{COR_ERRO}⚠️ Você precisa estar logado!{RESET_COR}")
         return
@@ -195,32 +156,20 @@ def listar_certificados():
 
 # ========== FUNÇÃO AUXILIAR ==========
 def verificar_conclusao(id_aluno: str, id_curso: str) -> bool:
-    """Verifica se o aluno concluiu o curso (IMPLEMENTE SUA LÓGICA AQUI)"""
-    # Exemplo simplificado - adapte para seu sistema
-    dados = get_usuarios_cadastrados()
-    cursos = get_cursos_disponiveis()
-    
-    if id_aluno not in dados or id_curso not in cursos:
+    """Verifica se o aluno concluiu todos os módulos do curso"""
+    if id_curso not in cursos_disponiveis:
         return False
-    
-    # Verifica se completou todos os módulos
-    modulos_concluidos = dados[id_aluno].get('modulos_concluidos', {}).get(id_curso, [])
-    return len(modulos_concluidos) == len(cursos[id_curso].get('modulos', []))
+    # Contadores em memória: não relê os usuários a cada verificação
+    return get_motor_progresso().concluiu(id_aluno, id_curso)
 
 
 def verificar_progresso(id_aluno: str, id_curso: str) -> float:
     """Calcula porcentagem de conclusão do curso (0 a 1)"""
-    dados = usuarios_cadastrados[id_aluno]
-    curso = cursos_disponiveis[id_curso]
-    
-    # Verifica módulos concluídos
-    modulos_concluidos = dados.get('modulos_concluidos', {}).get(id_curso, [])
-    total_modulos = len(curso['modulos'])
-    
-    return len(modulos_concluidos) / total_modulos if total_modulos > 0 else 0
+    return get_motor_progresso().percentual(id_aluno, id_curso)
 
-def tela_meus_cursos():
+def tela_meus_cursos(sessao: Optional[str] = None):
     """Mostra cursos matriculados e progresso"""
+    usuario_logado = get_usuario_logado(sessao)
     if not usuario_logado:
         print(f"{COR_ERRO}⚠️ Faça login primeiro!{RESET_COR}")
         return
@@ -234,7 +183,9 @@ def tela_meus_cursos():
         return
     
     for id_curso in usuarios_cadastrados[usuario]['cursos']:
-        curso = cursos_disponiveis[id_curso]
+        curso = cursos_disponiveis.get(id_curso)
+        if curso is None:  # Matrícula órfã de um curso deletado antes da remoção em cascata
+            continue
         progresso = verificar_progresso(usuario, id_curso)
         
         print(f"\n📚 {curso['nome']} ({id_curso})")
@@ -249,11 +200,18 @@ def tela_meus_cursos():
         
         escolha = input("\nEscolha (ou Enter para continuar): ")
         if escolha == '1' and progresso >= 1:
-            emitir_certificado(usuario, id_curso)
+            emitir_certificado(usuario, id_curso, sessao)
+        elif escolha == '2':
+            tela_progresso_curso(usuario, id_curso, sessao)
 
 
-def emitir_certificado(nome_aluno: str, id_curso: str):
+def emitir_certificado(nome_aluno: str, id_curso: str, sessao: Optional[str] = None):
     """Gera certificado PDF para cursos completos"""
+    usuario = get_usuario_logado(sessao)
+    if not usuario or (usuario['nome'] != nome_aluno and not eh_admin(sessao)):
+        print(f"{COR_ERRO}⚠️ Acesso restrito!{RESET_COR}")
+        return
+
     curso = cursos_disponiveis[id_curso]
     
     # Verifica requisitos
@@ -280,8 +238,8 @@ def emitir_certificado(nome_aluno: str, id_curso: str):
         'caminho': caminho
     })
     
-    salvar_usuarios()
-    registrar_log("Certificado emitido", f"Aluno: {nome_aluno} | Curso: {id_curso}")
+    salvar_usuarios(nome_aluno)
+    registrar_log("Certificado emitido", f"Aluno: {nome_aluno} | Curso: {id_curso}", alvo=nome_aluno, sessao=sessao)
     print(f"\n{COR_SUCESSO}✅ Certificado gerado com sucesso!{RESET_COR}")
     print(f"{COR_MENU}📄 Arquivo: {caminho}{RESET_COR}")
     input("\nPressione Enter para voltar...")
\ No newline at end of file
@@ -0,0 +1,131 @@
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from certificados.pdf import Certificado
+
+
+# ========== CONFIGURAÇÕES ==========
+TAMANHO_LOTE_PDF = 16     # Certificados enviados por vez a cada processo
+MAX_FALHAS_EXIBIDAS = 20
+COR_SUCESSO = "\033[1;32m"
+COR_ERRO = "\033[1;33m"
+COR_TITULO = "\033[1;35m"
+RESET_COR = "\033[0m"
+
+
+# ========== RENDERIZAÇÃO (PROCESSOS DE TRABALHO) ==========
+def _renderizar(tarefa: Tuple[str, str, str]) -> Tuple[str, Optional[Dict], Optional[str]]:
+    """Gera o PDF de um aluno: roda dentro do pool e devolve (nome, registro, erro)"""
+    nome_aluno, nome_curso, carga_horaria = tarefa
+    try:
+        cert = Certificado()
+        caminho = cert.gerar(nome_aluno, nome_curso, carga_horaria)
+    except Exception as e:
+        return nome_aluno, None, str(e)
+    return nome_aluno, {"codigo": cert.codigo, "data": datetime.now().isoformat(), "caminho": caminho}, None
+
+
+# ========== EMISSÃO EM LOTE ==========
+def alunos_aptos(id_curso: str, reemitir: bool = False) -> List[str]:
+    """Matriculados (pelo índice reverso) que concluíram o curso e ainda não têm o certificado"""
+    from usuarios.usuarios import recarregar_usuarios, alunos_matriculados
+    from certificados.certificados import verificar_conclusao
+    usuarios = recarregar_usuarios()
+    aptos = []
+    for nome in sorted(alunos_matriculados(id_curso)):
+        if not verificar_conclusao(nome, id_curso):
+            continue
+        if not reemitir and any(cert.get("curso") == id_curso
+                                for cert in usuarios[nome].get("certificados", [])):
+            continue
+        aptos.append(nome)
+    return aptos
+
+def emitir_em_lote(id_curso: str, sessao: Optional[str] = None, processos: Optional[int] = None,
+                   reemitir: bool = False) -> Tuple[int, List[Tuple[str, str]], float]:
+    """Gera os PDFs de todos os aptos em paralelo e grava os registros de uma vez.
+
+    Retorna (emitidos, [(aluno, erro), ...], segundos).
+    """
+    from usuarios.usuarios import usuarios_cadastrados, salvar_usuarios, registrar_log
+    from cursos.cursos import cursos_disponiveis
+
+    curso = cursos_disponiveis.get(id_curso)
+    if curso is None:
+        raise ValueError(f"Curso não encontrado: {id_curso}")
+    aptos = alunos_aptos(id_curso, reemitir)
+    tarefas = [(nome, curso["nome"], curso["carga_horaria"]) for nome in aptos]
+
+    inicio = time.perf_counter()
+    emitidos, falhas = [], []
+    if tarefas:
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            for nome, registro, erro in pool.map(_renderizar, tarefas, chunksize=TAMANHO_LOTE_PDF):
+                if erro:
+                    falhas.append((nome, erro))
+                    continue
+                usuarios_cadastrados[nome].setdefault("certificados", []).append({"curso": id_curso, **registro})
+                emitidos.append(nome)
+    if emitidos:
+        salvar_usuarios(*emitidos)  # Uma gravação com todos os certificados do lote
+    segundos = time.perf_counter() - inicio
+
+    registrar_log("Certificados emitidos em lote",
+                  f"Curso: {id_curso} | Emitidos: {len(emitidos)} | Falhas: {len(falhas)} | {segundos:.1f}s",
+                  alvo=id_curso, sessao=sessao)
+    return len(emitidos), falhas, segundos
+
+def exibir_resultado(emitidos: int, falhas: List[Tuple[str, str]], segundos: float):
+    vazao = emitidos / segundos if segundos > 0 else 0.0
+    print(f"{COR_SUCESSO}✅ {emitidos} certificados em {segundos:.1f}s ({vazao:.1f} certificados/s){RESET_COR}")
+    if not falhas:
+        return
+    print(f"{COR_ERRO}⚠️ {len(falhas)} falhas:")
+    for nome, erro in falhas[:MAX_FALHAS_EXIBIDAS]:
+        print(f"  {nome}: {erro}")
+    if len(falhas) > MAX_FALHAS_EXIBIDAS:
+        print(f"  ... e mais {len(falhas) - MAX_FALHAS_EXIBIDAS}")
+    print(RESET_COR, end="")
+
+
+# ========== INTERFACE ==========
+def tela_emissao_lote(sessao: Optional[str] = None):
+    """Emissão de fim de período pelo menu de certificados (apenas ADM)"""
+    from usuarios.usuarios import eh_admin
+    from cursos.cursos import listar_cursos
+    if not eh_admin(sessao):
+        print(f"{COR_ERRO}⚠️ Acesso restrito!{RESET_COR}")
+        return
+
+    print(f"\n{COR_TITULO}=== EMISSÃO DE CERTIFICADOS EM LOTE ===")
+    listar_cursos(incluir_arquivados=True)
+    id_curso = input("\nID do curso: ").strip()
+    aptos = alunos_aptos(id_curso)
+    if not aptos:
+        print(f"{COR_ERRO}⚠️ Nenhum aluno apto sem certificado neste curso{RESET_COR}")
+        return
+    confirmacao = input(f"{len(aptos)} alunos aptos. Emitir? (S/N): ").strip().upper()
+    if confirmacao != 'S':
+        print(f"{COR_ERRO}❌ Cancelado{RESET_COR}")
+        return
+    try:
+        exibir_resultado(*emitir_em_lote(id_curso, sessao))
+    except ValueError as e:
+        print(f"{COR_ERRO}❌ {e}{RESET_COR}")
+    print("="*40 + RESET_COR)
+
+
+if __name__ == "__main__":
+    # Uso: python -m certificados.lote <id_curso> [processos]
+    if len(sys.argv) < 2:
+        print(f"{COR_ERRO}Uso: python -m certificados.lote <id_curso> [processos]{RESET_COR}")
+        sys.exit(1)
+    try:
+        resultado = emitir_em_lote(sys.argv[1], processos=int(sys.argv[2]) if len(sys.argv) > 2 else None)
+    except ValueError as e:
+        print(f"{COR_ERRO}❌ {e}{RESET_COR}")
+        sys.exit(1)
+    exibir_resultado(*resultado)
+    sys.exit(1 if resultado[1] else 0)
@@ -0,0 +1,50 @@
+import hashlib
+import os
+from datetime import datetime
+from fpdf import FPDF
+
+# Só o PDF: os processos do lote importam este módulo sem carregar usuários e cursos
+
+# ========== CONFIGURAÇÕES DE PASTAS ==========
+PASTA_CERTIFICADOS = "certificados"
+os.makedirs(PASTA_CERTIFICADOS, exist_ok=True)
+
+# ========== CLASSE CERTIFICADO ==========
+class Certificado:
+    def __init__(self):
+        self.codigo = None
+        self.caminho = None
+
+    def gerar(self, nome_aluno: str, nome_curso: str, carga_horaria: str):
+        """Gera um certificado em PDF"""
+        self._gerar_codigo(nome_aluno, nome_curso)
+        self.caminho = f"{PASTA_CERTIFICADOS}/{self.codigo}.pdf"
+
+        pdf = FPDF()
+        pdf.add_page()
+        
+        pdf.set_font("Arial", size=24)
+        pdf.set_text_color(10, 50, 150)
+        pdf.cell(0, 40, txt="CERTIFICADO", ln=True, align='C')
+        pdf.ln(20)
+        
+        pdf.set_font("Arial", size=16)
+        pdf.set_text_color(0, 0, 0)
+        pdf.multi_cell(0, 10, 
+            f"Certificamos que {nome_aluno} concluiu com êxito o curso "
+            f"'{nome_curso}' com carga horária de {carga_horaria}.\n\n"
+            f"Data de emissão: {datetime.now().strftime('%d/%m/%Y')}\n\n"
+            f"Código de validação: {self.codigo}",
+            align='C')
+        
+        pdf.set_y(-30)
+        pdf.set_font("Arial", style='I', size=12)
+        pdf.cell(0, 10, txt="Este certificado pode ser validado em nossa plataforma", ln=True, align='C')
+        
+        pdf.output(self.caminho)
+        return self.caminho
+
+    def _gerar_codigo(self, nome_aluno: str, nome_curso: str):
+        """Cria um código único baseado em hash"""
+        base = f"{nome_aluno}{nome_curso}{datetime.now()}"
+        self.codigo = "CERT-" + hashlib.sha256(base.encode()).hexdigest()[:12].upper()
@@ -0,0 +1,137 @@
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from operator import itemgetter
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+from cursos.estrutura import modulos_em_ordem
+
+
+# ========== CONFIGURAÇÕES ==========
+PESOS = {"curso": 3.0, "modulo": 2.0, "aula": 1.0}  # Nome de curso pesa mais que título de aula
+PESO_PREFIXO = 0.5  # 'prog' acha 'programação', mas vale menos que a palavra inteira
+TAMANHO_MIN_PREFIXO = 2  # Uma letra só casaria com quase todo o catálogo
+
+
+# ========== NORMALIZAÇÃO ==========
+def normalizar(texto: str) -> str:
+    """Minúsculas e sem acentos: 'Programação' -> 'programacao'"""
+    decomposto = unicodedata.normalize("NFKD", str(texto))
+    return "".join(c for c in decomposto if not unicodedata.combining(c)).casefold()
+
+def tokenizar(texto: str) -> List[str]:
+    return re.findall(r"\w+", normalizar(texto))
+
+def titulo_aula(aula) -> str:
+    """Aulas podem ser texto simples ou dicts com 'titulo'/'nome'"""
+    if isinstance(aula, dict):
+        return str(aula.get("titulo") or aula.get("nome") or "")
+    return str(aula)
+
+
+# ========== ÍNDICE INVERTIDO ==========
+def documentos_do_curso(id_curso: str, curso: Dict) -> Iterator[Tuple[tuple, str, str]]:
+    """Gera (chave, tipo, texto) do curso, de cada módulo e de cada aula"""
+    yield ("curso", id_curso), "curso", curso.get("nome", "")
+    for id_modulo, modulo in modulos_em_ordem(curso):
+        yield ("modulo", id_curso, id_modulo), "modulo", modulo.get("nome", "")
+        for posicao_aula, aula in enumerate(modulo.get("aulas", [])):
+            yield ("aula", id_curso, id_modulo, posicao_aula), "aula", titulo_aula(aula)
+
+class IndiceBusca:
+    """Índice invertido termo -> {documento: peso}, com termos ordenados para busca por prefixo.
+
+    Atualizado por curso: qualquer mudança num curso reindexa só os documentos dele.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[tuple, float]] = {}
+        self.termos: List[str] = []                       # Ordenados, para o prefixo por bisect
+        self.textos: Dict[tuple, str] = {}                # Documento -> texto original
+        self._por_curso: Dict[str, Dict[tuple, Dict[str, float]]] = {}
+
+    def reconstruir(self, cursos: Mapping):
+        self.__init__()
+        for id_curso, curso in cursos.items():
+            self._indexar(id_curso, curso, ordenar=False)
+        self.termos = sorted(self.postings)
+
+    def atualizar_curso(self, id_curso: str, curso: Optional[Dict]):
+        """Reindexa um curso (curso=None quando foi removido)"""
+        for doc, pesos in self._por_curso.pop(id_curso, {}).items():
+            del self.textos[doc]
+            for termo in pesos:
+                lista = self.postings[termo]
+                del lista[doc]
+                if not lista:
+                    del self.postings[termo]
+                    del self.termos[bisect_left(self.termos, termo)]
+        if curso is not None:
+            self._indexar(id_curso, curso, ordenar=True)
+
+    def _indexar(self, id_curso: str, curso: Dict, ordenar: bool):
+        docs = self._por_curso[id_curso] = {}
+        for doc, tipo, texto in documentos_do_curso(id_curso, curso):
+            tokens = tokenizar(texto)
+            if not tokens:
+                continue
+            self.textos[doc] = texto
+            # Títulos curtos em que o termo aparece ganham dos longos
+            base = PESOS[tipo] / len(tokens) ** 0.5
+            pesos = docs[doc] = {}
+            for token in tokens:
+                pesos[token] = pesos.get(token, 0.0) + base
+            for termo, peso in pesos.items():
+                lista = self.postings.get(termo)
+                if lista is None:
+                    lista = self.postings[termo] = {}
+                    if ordenar:
+                        insort(self.termos, termo)
+                lista[doc] = peso
+
+    def _expandir(self, termo: str) -> List[Tuple[Dict[tuple, float], float]]:
+        """Listas de postings que casam com o termo: a exata e, se houver, as de prefixo"""
+        listas = []
+        if termo in self.postings:
+            listas.append((self.postings[termo], 1.0))
+        if len(termo) >= TAMANHO_MIN_PREFIXO:
+            i = bisect_left(self.termos, termo)
+            while i < len(self.termos) and self.termos[i].startswith(termo):
+                if self.termos[i] != termo:
+                    listas.append((self.postings[self.termos[i]], PESO_PREFIXO))
+                i += 1
+        return listas
+
+    def buscar(self, consulta: str, limite: int = 20) -> List[Tuple[float, tuple, str]]:
+        """Documentos com todos os termos da consulta, do mais relevante ao menos"""
+        grupos = [self._expandir(termo) for termo in dict.fromkeys(tokenizar(consulta))]
+        if not grupos or not all(grupos):
+            return []
+        if len(grupos) == 1 and len(grupos[0]) == 1:
+            # Um termo sem variações: ordena direto a lista, sem copiar as pontuações
+            lista, _ = grupos[0][0]
+            melhores = heapq.nlargest(limite, lista.items(), key=itemgetter(1))
+            return [(pontuacao, doc, self.textos[doc]) for doc, pontuacao in melhores]
+        # O termo mais raro gera os candidatos; os demais só são consultados para eles
+        grupos.sort(key=lambda grupo: sum(len(lista) for lista, _ in grupo))
+        pontos: Dict[tuple, float] = {}
+        for lista, fator in grupos[0]:
+            for doc, peso in lista.items():
+                if peso * fator > pontos.get(doc, 0.0):
+                    pontos[doc] = peso * fator
+        for grupo in grupos[1:]:
+            restantes = {}
+            for doc, parcial in pontos.items():
+                melhor = 0.0
+                for lista, fator in grupo:
+                    peso = lista.get(doc)
+                    if peso is not None and peso * fator > melhor:
+                        melhor = peso * fator
+                if melhor:
+                    restantes[doc] = parcial + melhor
+            if not restantes:
+                return []
+            pontos = restantes
+        melhores = heapq.nlargest(limite, pontos.items(), key=itemgetter(1))
+        return [(pontuacao, doc, self.textos[doc]) for doc, pontuacao in melhores]
@@ -1,43 +1,80 @@
-import json
-import os
 from datetime import datetime
-from usuarios.usuarios import usuario_logado, eh_admin, registrar_log, usuarios_cadastrados, salvar_usuarios
+from typing import List, Optional
+from armazenamento.armazenamento import get_repositorio
+from cursos.busca import IndiceBusca
+from cursos.estrutura import normalizar_modulos, modulos_em_ordem
+from cursos.progresso import MotorProgresso
+from usuarios.usuarios import get_usuario_logado, eh_admin, registrar_log, usuarios_cadastrados, salvar_usuarios
+from usuarios.usuarios import recarregar_usuarios, alunos_matriculados
 
 # ========== CONFIGURAÇÕES ==========
-ARQUIVO_CURSOS = "cursos.json"
 COR_SUCESSO = "\033[1;32m"
 COR_ERRO = "\033[1;31m"
 COR_TITULO = "\033[1;36m"
 RESET_COR = "\033[0m"
 COR_ALERTA = "\033[1;33m"  # Amarelo
+LIMITE_RESULTADOS_BUSCA = 15
 
 # ========== BANCO DE DADOS ==========
 def carregar_cursos() -> dict:
-    """Carrega cursos do JSON ou cria estrutura inicial"""
-    if os.path.exists(ARQUIVO_CURSOS):
-        with open(ARQUIVO_CURSOS, 'r') as f:
-            return json.load(f)
+    """Carrega cursos pelo repositório configurado ou cria estrutura inicial"""
+    cursos = get_repositorio().carregar_cursos()
+    if cursos is not None:
+        # Arquivos antigos guardam os módulos em lista: converte e grava uma vez
+        convertidos = [id_curso for id_curso, curso in cursos.items() if normalizar_modulos(curso)]
+        if convertidos:
+            get_repositorio().salvar_cursos(cursos, convertidos)
+        return cursos
     
     return {
         "1": {
             "nome": "Introdução à Programação",
             "carga_horaria": "40h",
-            "modulos": [],
+            "modulos": {},
+            "ordem_modulos": [],
+            "proximo_id_modulo": 1,
             "criado_por": "Sistema",
             "data_criacao": datetime.now().isoformat()
         }
     }
 
-def salvar_cursos():
-    """Salva os cursos no arquivo JSON"""
-    with open(ARQUIVO_CURSOS, 'w') as f:
-        json.dump(cursos_disponiveis, f, indent=4, ensure_ascii=False)
+def salvar_cursos(*ids: str):
+    """Salva os cursos alterados (ou todos, se nenhum ID for passado)"""
+    global _indice_pronto
+    externos = get_repositorio().salvar_cursos(cursos_disponiveis, ids)
+    for id_curso in externos:
+        if id_curso in cursos_disponiveis:
+            normalizar_modulos(cursos_disponiveis[id_curso])
+    if not ids:
+        _indice_pronto = False
+        _motor_progresso.invalidar()
+    for id_curso in set(ids).union(externos):
+        _motor_progresso.invalidar(id_curso)
+    if ids and _indice_pronto:
+        # Reindexa só os cursos alterados aqui e os que outro processo mudou
+        for id_curso in set(ids).union(externos):
+            _indice_busca.atualizar_curso(id_curso, cursos_disponiveis.get(id_curso))
+
+def get_indice_busca() -> IndiceBusca:
+    """Índice de busca do catálogo, montado na primeira consulta"""
+    global _indice_pronto
+    if not _indice_pronto:
+        _indice_busca.reconstruir(cursos_disponiveis)
+        _indice_pronto = True
+    return _indice_busca
+
+def get_motor_progresso() -> MotorProgresso:
+    """Contadores de conclusão por (aluno, curso), consultados em O(1)"""
+    return _motor_progresso
 
 # Dados globais
 cursos_disponiveis = carregar_cursos()
+_indice_busca = IndiceBusca()
+_indice_pronto = False
+_motor_progresso = MotorProgresso(cursos_disponiveis)
 
 # ========== OPERAÇÕES PRINCIPAIS ==========
-def tela_cursos():
+def tela_cursos(sessao: Optional[str] = None):
     """Menu principal de cursos"""
     while True:
         print(f"\n{COR_TITULO}=== GERENCIAMENTO DE CURSOS ===")
@@ -45,6 +82,8 @@ def tela_cursos():
         print("2. ➕ Criar novo curso (ADM)")
         print("3. ✏️ Editar curso (ADM)")
         print("4. 🗑️ Deletar curso (ADM)")  # Nova opção
+        print("5. 🔎 Buscar cursos, módulos e aulas")
+        print("6. 📦 Arquivar/reativar curso (ADM)")
         print("0. ↩ Voltar")
         print("="*40 + RESET_COR)
         
@@ -53,18 +92,25 @@ def tela_cursos():
         if escolha == '1':
             listar_cursos(completo=True)
         elif escolha == '2':
-            if eh_admin():
-                criar_curso()
+            if eh_admin(sessao):
+                criar_curso(sessao)
             else:
                 print(f"{COR_ERRO}⚠️ Apenas ADMs podem criar cursos!{RESET_COR}")
         elif escolha == '3':
-            if eh_admin():
-                editar_curso()
+            if eh_admin(sessao):
+                editar_curso(sessao)
             else:
                 print(f"{COR_ERRO}⚠️ Acesso restrito!{RESET_COR}")
         elif escolha == '4':  # Nova opção
-            if eh_admin():
-                deletar_curso()
+            if eh_admin(sessao):
+                deletar_curso(sessao)
+            else:
+                print(f"{COR_ERRO}⚠️ Acesso restrito!{RESET_COR}")
+        elif escolha == '5':
+            buscar_catalogo()
+        elif escolha == '6':
+            if eh_admin(sessao):
+                arquivar_curso(sessao)
             else:
                 print(f"{COR_ERRO}⚠️ Acesso restrito!{RESET_COR}")
         elif escolha == '0':
@@ -73,8 +119,9 @@ def tela_cursos():
             print(f"{COR_ERRO}❌ Opção inválida!{RESET_COR}")
 
 
-def matricular_aluno():
+def matricular_aluno(sessao: Optional[str] = None):
     """Permite ao usuário se matricular em cursos disponíveis"""
+    usuario_logado = get_usuario_logado(sessao)
     if not usuario_logado:
         print(f"{COR_ERRO}⚠️ Faça login primeiro!{RESET_COR}")
         return
@@ -86,13 +133,16 @@ def matricular_aluno():
     if id_curso not in cursos_disponiveis:
         print(f"{COR_ERRO}❌ Curso não encontrado!{RESET_COR}")
         return
+    if cursos_disponiveis[id_curso].get("arquivado"):
+        print(f"{COR_ALERTA}⚠️ Curso arquivado: não aceita novas matrículas{RESET_COR}")
+        return
 
     # Adiciona aos cursos do usuário
     usuario = usuario_logado['nome']
     if id_curso not in usuarios_cadastrados[usuario]['cursos']:
         usuarios_cadastrados[usuario]['cursos'].append(id_curso)
-        salvar_usuarios()
-        registrar_log("Matrícula realizada", f"Usuário: {usuario} | Curso: {id_curso}")
+        salvar_usuarios(usuario)
+        registrar_log("Matrícula realizada", f"Usuário: {usuario} | Curso: {id_curso}", alvo=usuario, sessao=sessao)
         print(f"\n{COR_SUCESSO}✅ Matrícula realizada com sucesso!{RESET_COR}")
     else:
         print(f"{COR_ALERTA}⚠️ Você já está matriculado neste curso!{RESET_COR}")
@@ -100,7 +150,7 @@ def matricular_aluno():
     input("Pressione Enter para voltar...")            
 
 # ========== FUNÇÕES DE GERENCIAMENTO ==========
-def criar_curso():
+def criar_curso(sessao: Optional[str] = None):
     """Cadastro de novos cursos (apenas ADM)"""
     print(f"\n{COR_TITULO}=== NOVO CURSO ===")
     
@@ -117,16 +167,18 @@ def criar_curso():
     cursos_disponiveis[novo_id] = {
         "nome": nome,
         "carga_horaria": carga_horaria,
-        "modulos": [],
-        "criado_por": usuario_logado["nome"],  # Corrigido
+        "modulos": {},
+        "ordem_modulos": [],
+        "proximo_id_modulo": 1,
+        "criado_por": get_usuario_logado(sessao)["nome"],  # Corrigido
         "data_criacao": datetime.now().isoformat()
     }
     
-    salvar_cursos()
-    registrar_log("Curso criado", f"ID: {novo_id} | Nome: {nome}")
+    salvar_cursos(novo_id)
+    registrar_log("Curso criado", f"ID: {novo_id} | Nome: {nome}", alvo=novo_id, sessao=sessao)
     print(f"\n{COR_SUCESSO}✅ Curso criado com sucesso!{RESET_COR}")
 
-def editar_curso():
+def editar_curso(sessao: Optional[str] = None):
     """Edição de cursos existentes (apenas ADM)"""
     print(f"\n{COR_TITULO}=== EDITAR CURSO ===")
     listar_cursos()
@@ -149,15 +201,15 @@ def editar_curso():
         cursos_disponiveis[id_curso]["carga_horaria"] = nova_carga
     
     cursos_disponiveis[id_curso]["ultima_edicao"] = {
-        "por": usuario_logado["nome"],  # Corrigido
+        "por": get_usuario_logado(sessao)["nome"],  # Corrigido
         "em": datetime.now().isoformat()
     }
     
-    salvar_cursos()
-    registrar_log("Curso editado", f"ID: {id_curso}")
+    salvar_cursos(id_curso)
+    registrar_log("Curso editado", f"ID: {id_curso}", alvo=id_curso, sessao=sessao)
     print(f"\n{COR_SUCESSO}✅ Curso atualizado!{RESET_COR}")
 
-def deletar_curso():
+def deletar_curso(sessao: Optional[str] = None):
     """Remove um curso existente (apenas ADM)"""
     print(f"\n{COR_TITULO}=== DELETAR CURSO ===")
     listar_cursos()
@@ -169,29 +221,78 @@ def deletar_curso():
         return
     
     curso = cursos_disponiveis[id_curso]
+    recarregar_usuarios()
+    total_alunos = len(alunos_matriculados(id_curso))
+    if total_alunos:
+        print(f"{COR_ALERTA}⚠️ {total_alunos} alunos matriculados perderão a matrícula e o progresso{RESET_COR}")
     confirmacao = input(f"\nTem certeza que deseja deletar o curso '{curso['nome']}'? (S/N): ").upper()
     
     if confirmacao == 'S':
+        afetados = remover_matriculas(id_curso)
         del cursos_disponiveis[id_curso]
-        salvar_cursos()
-        registrar_log("Curso deletado", f"ID: {id_curso} | Nome: {curso['nome']}")
+        salvar_cursos(id_curso)
+        registrar_log("Curso deletado", f"ID: {id_curso} | Nome: {curso['nome']} | Alunos desmatriculados: {len(afetados)}",
+                      alvo=id_curso, sessao=sessao)
         print(f"\n{COR_SUCESSO}✅ Curso deletado com sucesso!{RESET_COR}")
     else:
         print(f"{COR_ALERTA}❌ Operação cancelada.{RESET_COR}")
 
+def arquivar_curso(sessao: Optional[str] = None):
+    """Arquiva (ou reativa) um curso: some das listagens e fecha novas matrículas.
+
+    Quem já está matriculado mantém matrícula, progresso e certificados.
+    """
+    print(f"\n{COR_TITULO}=== ARQUIVAR CURSO ===")
+    listar_cursos(incluir_arquivados=True)
+    
+    id_curso = input("\nID do curso: ").strip()
+    if id_curso not in cursos_disponiveis:
+        print(f"{COR_ERRO}❌ Curso não encontrado!{RESET_COR}")
+        return
+    
+    curso = cursos_disponiveis[id_curso]
+    if curso.get("arquivado"):
+        del curso["arquivado"]
+        acao = "Curso reativado"
+    else:
+        curso["arquivado"] = {"por": get_usuario_logado(sessao)["nome"], "em": datetime.now().isoformat()}
+        acao = "Curso arquivado"
+    salvar_cursos(id_curso)
+    registrar_log(acao, f"ID: {id_curso} | Nome: {curso['nome']} | Alunos: {len(alunos_matriculados(id_curso))}",
+                  alvo=id_curso, sessao=sessao)
+    print(f"\n{COR_SUCESSO}✅ {acao}!{RESET_COR}")
+
+def remover_matriculas(id_curso: str) -> List[str]:
+    """Tira o curso da matrícula e do progresso de quem o cursa, numa única gravação.
+
+    Os alunos vêm do índice reverso curso -> alunos: só eles são lidos e gravados.
+    """
+    afetados = sorted(alunos_matriculados(id_curso))  # Cópia: salvar_usuarios altera o índice
+    for nome in afetados:
+        dados = usuarios_cadastrados[nome]
+        dados["cursos"] = [c for c in dados.get("cursos", []) if c != id_curso]
+        dados.get("modulos_concluidos", {}).pop(id_curso, None)
+    if afetados:
+        salvar_usuarios(*afetados)
+    return afetados
+
 # ========== FUNÇÕES AUXILIARES ==========
-def listar_cursos(completo: bool = False):
+def listar_cursos(completo: bool = False, incluir_arquivados: bool = False):
     """Lista todos os cursos com detalhes"""
     print(f"\n{COR_TITULO}=== CURSOS DISPONÍVEIS ===")
     for id_curso, curso in cursos_disponiveis.items():
-        print(f"\n{id_curso}. {curso['nome']} ({curso['carga_horaria']})")
+        if curso.get("arquivado") and not incluir_arquivados:
+            continue
+        arquivado = " [arquivado]" if curso.get("arquivado") else ""
+        print(f"\n{id_curso}. {curso['nome']} ({curso['carga_horaria']}){arquivado}")
         print(f"   Criado por: {curso['criado_por']}")
         print(f"   Data: {curso['data_criacao'][:10]}")
         
         if completo:
+            print(f"   Alunos matriculados: {len(alunos_matriculados(id_curso))}")
             if curso["modulos"]:
                 print("   Módulos:")
-                for mod in curso["modulos"]:
+                for _, mod in modulos_em_ordem(curso):
                     print(f"     - {mod['nome']} (por {mod['criado_por']})")
             else:
                 print("   Nenhum módulo cadastrado")
@@ -200,6 +301,27 @@ def listar_cursos(completo: bool = False):
     if completo:
         input("\nPressione Enter para continuar...")
 
+def buscar_catalogo(consulta: Optional[str] = None):
+    """Busca por palavras (sem diferenciar acentos) em cursos, módulos e aulas"""
+    if consulta is None:
+        consulta = input("\nBuscar: ").strip()
+    resultados = get_indice_busca().buscar(consulta, LIMITE_RESULTADOS_BUSCA)
+
+    print(f"\n{COR_TITULO}=== RESULTADOS PARA '{consulta}' ===")
+    if not resultados:
+        print(f"{COR_ALERTA}Nada encontrado{COR_TITULO}")
+    for _, doc, texto in resultados:
+        curso = cursos_disponiveis.get(doc[1], {})
+        if doc[0] == "curso":
+            print(f"📚 {doc[1]}. {texto} ({curso.get('carga_horaria', '')})")
+        elif doc[0] == "modulo":
+            print(f"   📦 {texto} — curso {doc[1]}. {curso.get('nome', '')}")
+        else:
+            modulo = curso["modulos"][doc[2]]
+            print(f"      🎬 {texto} — {modulo['nome']} / curso {doc[1]}. {curso.get('nome', '')}")
+    print("="*40 + RESET_COR)
+    input("\nPressione Enter para continuar...")
+
 def get_curso(id_curso: str) -> dict:
     """Retorna os dados de um curso específico"""
     return cursos_disponiveis.get(id_curso, {})
\ No newline at end of file
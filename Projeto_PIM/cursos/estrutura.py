@@ -0,0 +1,71 @@
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+
+# ========== ESTRUTURA DE MÓDULOS ==========
+# Cada curso guarda:
+#   "modulos": {id_modulo: modulo}   -> busca O(1) por ID estável
+#   "ordem_modulos": [id_modulo...]  -> ordem de exibição (reordenar não mexe nos módulos)
+#   "proximo_id_modulo": int         -> IDs nunca são reaproveitados
+def normalizar_modulos(curso: Dict) -> bool:
+    """Converte a lista antiga de módulos para o formato com IDs; True se converteu.
+
+    Os IDs seguem a posição antiga (1, 2, 3...), o que permite converter também o
+    progresso gravado por posição (ver ids_concluidos).
+    """
+    modulos = curso.get("modulos")
+    if isinstance(modulos, dict) and "ordem_modulos" in curso:
+        return False
+    lista = list(modulos.values()) if isinstance(modulos, dict) else (modulos or [])
+    curso["modulos"] = {str(i): modulo for i, modulo in enumerate(lista, 1)}
+    curso["ordem_modulos"] = list(curso["modulos"])
+    curso["proximo_id_modulo"] = len(lista) + 1
+    return True
+
+def modulos_em_ordem(curso: Dict) -> Iterator[Tuple[str, Dict]]:
+    modulos = curso.get("modulos", {})
+    for id_modulo in curso.get("ordem_modulos", []):
+        if id_modulo in modulos:
+            yield id_modulo, modulos[id_modulo]
+
+def novo_id_modulo(curso: Dict) -> str:
+    proximo = curso.get("proximo_id_modulo", 1)
+    while str(proximo) in curso["modulos"]:
+        proximo += 1
+    curso["proximo_id_modulo"] = proximo + 1
+    return str(proximo)
+
+def incluir_modulo(curso: Dict, modulo: Dict) -> str:
+    """Adiciona o módulo no fim da ordem e retorna o ID gerado"""
+    id_modulo = novo_id_modulo(curso)
+    curso["modulos"][id_modulo] = modulo
+    curso["ordem_modulos"].append(id_modulo)
+    return id_modulo
+
+def excluir_modulo(curso: Dict, id_modulo: str) -> Dict:
+    modulo = curso["modulos"].pop(id_modulo)
+    curso["ordem_modulos"].remove(id_modulo)
+    return modulo
+
+def mover_modulo(curso: Dict, id_modulo: str, posicao: int):
+    """Coloca o módulo na posição indicada (1 = primeiro); só a lista de ordem muda"""
+    ordem = curso["ordem_modulos"]
+    ordem.remove(id_modulo)
+    ordem.insert(max(0, min(posicao - 1, len(ordem))), id_modulo)
+
+
+# ========== PROGRESSO ==========
+def ids_concluidos(concluidos: Iterable) -> List[str]:
+    """IDs de módulos concluídos; posições antigas (0, 1, ...) viram os IDs da conversão"""
+    return [str(item + 1) if isinstance(item, int) else str(item) for item in concluidos]
+
+def concluidos_no_curso(curso: Dict, concluidos: Iterable) -> Set[str]:
+    """Só os concluídos que ainda existem no curso (módulos removidos não contam)"""
+    return set(ids_concluidos(concluidos)) & curso.get("modulos", {}).keys()
+
+def mascara_modulos(ids: Iterable) -> int:
+    """Bitset com o bit int(id) ligado para cada ID de módulo (aceita posições antigas)"""
+    mascara = 0
+    for id_modulo in ids_concluidos(ids):
+        if id_modulo.isdigit():
+            mascara |= 1 << int(id_modulo)
+    return mascara
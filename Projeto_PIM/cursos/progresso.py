@@ -0,0 +1,143 @@
+from typing import Dict, Mapping, Optional, Tuple
+
+from cursos.estrutura import mascara_modulos, modulos_em_ordem
+from usuarios.usuarios import (get_indices, usuarios_cadastrados, salvar_usuarios, registrar_log,
+                               get_usuario_logado, eh_admin)
+
+
+# ========== CONFIGURAÇÕES ==========
+COR_SUCESSO = "\033[1;32m"
+COR_ERRO = "\033[1;31m"
+COR_TITULO = "\033[1;36m"
+COR_ALERTA = "\033[1;33m"
+RESET_COR = "\033[0m"
+
+
+# ========== MOTOR DE PROGRESSO ==========
+# O lado do aluno é um bitset por (aluno, curso) mantido em IndicesUsuarios.progresso;
+# o lado do curso é o bitset dos módulos que existem hoje. O progresso é a contagem de
+# bits da interseção: incluir ou remover um módulo muda só o bitset do curso.
+class MotorProgresso:
+    """Bitset e total de módulos de cada curso, recalculados só quando o curso muda"""
+
+    def __init__(self, cursos: Mapping):
+        self.cursos = cursos
+        self._por_curso: Dict[str, Tuple[int, int]] = {}  # id_curso -> (bitset, total)
+
+    def invalidar(self, id_curso: Optional[str] = None):
+        """Descarta o cache de um curso (ou de todos) depois de uma gravação"""
+        if id_curso is None:
+            self._por_curso.clear()
+        else:
+            self._por_curso.pop(id_curso, None)
+
+    def do_curso(self, id_curso: str) -> Tuple[int, int]:
+        cache = self._por_curso.get(id_curso)
+        if cache is None:
+            modulos = self.cursos.get(id_curso, {}).get("modulos", {})
+            cache = self._por_curso[id_curso] = (mascara_modulos(modulos), len(modulos))
+        return cache
+
+    def contar(self, nome: str, id_curso: str) -> Tuple[int, int]:
+        """(módulos concluídos que ainda existem, total de módulos) em O(1)"""
+        mascara, total = self.do_curso(id_curso)
+        return (get_indices().modulos_concluidos(nome, id_curso) & mascara).bit_count(), total
+
+    def percentual(self, nome: str, id_curso: str) -> float:
+        concluidos, total = self.contar(nome, id_curso)
+        return concluidos / total if total else 0.0
+
+    def concluiu(self, nome: str, id_curso: str) -> bool:
+        """Curso sem módulos nunca conta como concluído"""
+        concluidos, total = self.contar(nome, id_curso)
+        return total > 0 and concluidos == total
+
+
+# ========== REGISTRO DE CONCLUSÃO ==========
+def _validar(nome: str, id_curso: str, id_modulo: str) -> Dict:
+    from cursos.cursos import cursos_disponiveis
+    dados = usuarios_cadastrados.get(nome)
+    if dados is None:
+        raise ValueError(f"Usuário não encontrado: {nome}")
+    if id_curso not in dados.get("cursos", []):
+        raise ValueError(f"{nome} não está matriculado no curso {id_curso}")
+    curso = cursos_disponiveis.get(id_curso)
+    if curso is None or id_modulo not in curso.get("modulos", {}):
+        raise ValueError(f"Módulo {id_modulo} não existe no curso {id_curso}")
+    return dados
+
+def _incluir_modulo_concluido(nome: str, dados: Dict, id_curso: str, id_modulo: str) -> bool:
+    if get_indices().modulos_concluidos(nome, id_curso) >> int(id_modulo) & 1:
+        return False
+    dados.setdefault("modulos_concluidos", {}).setdefault(id_curso, []).append(id_modulo)
+    return True
+
+def marcar_modulo(nome: str, id_curso: str, id_modulo: str, sessao: Optional[str] = None) -> bool:
+    """Registra o módulo como concluído; False se já estava. Levanta ValueError se inválido."""
+    dados = _validar(nome, id_curso, id_modulo)
+    if not _incluir_modulo_concluido(nome, dados, id_curso, id_modulo):
+        return False
+    salvar_usuarios(nome)  # Sincroniza o bitset do aluno no índice
+    registrar_log("Módulo concluído", f"Aluno: {nome} | Curso: {id_curso} | Módulo: {id_modulo}",
+                  alvo=nome, sessao=sessao)
+    return True
+
+def marcar_aula(nome: str, id_curso: str, id_modulo: str, posicao_aula: int,
+                sessao: Optional[str] = None) -> bool:
+    """Registra a aula (posição no módulo) como assistida; True se isso concluiu o módulo"""
+    from cursos.cursos import cursos_disponiveis
+    dados = _validar(nome, id_curso, id_modulo)
+    aulas = cursos_disponiveis[id_curso]["modulos"][id_modulo].get("aulas", [])
+    if not 0 <= posicao_aula < len(aulas):
+        raise ValueError(f"Aula {posicao_aula + 1} não existe no módulo {id_modulo}")
+
+    assistidas = dados.setdefault("aulas_concluidas", {}).setdefault(id_curso, {}).setdefault(id_modulo, [])
+    if posicao_aula not in assistidas:
+        assistidas.append(posicao_aula)
+    concluiu = (len(set(assistidas) & set(range(len(aulas)))) == len(aulas)
+                and _incluir_modulo_concluido(nome, dados, id_curso, id_modulo))
+    salvar_usuarios(nome)  # Aula e, se for o caso, módulo numa gravação só
+    if concluiu:
+        registrar_log("Módulo concluído", f"Aluno: {nome} | Curso: {id_curso} | Módulo: {id_modulo}",
+                      alvo=nome, sessao=sessao)
+    return concluiu
+
+
+# ========== INTERFACE ==========
+def tela_progresso_curso(nome: str, id_curso: str, sessao: Optional[str] = None):
+    """Mostra os módulos do curso com o status do aluno e permite marcar a conclusão"""
+    from cursos.cursos import cursos_disponiveis, get_motor_progresso
+    logado = get_usuario_logado(sessao)
+    if not logado or (logado["nome"] != nome and not eh_admin(sessao)):
+        print(f"{COR_ERRO}⚠️ Acesso restrito!{RESET_COR}")
+        return
+    curso = cursos_disponiveis.get(id_curso)
+    if curso is None:
+        print(f"{COR_ERRO}❌ Curso não encontrado!{RESET_COR}")
+        return
+
+    while True:
+        motor = get_motor_progresso()
+        concluidos = get_indices().modulos_concluidos(nome, id_curso)
+        ordem = [id_modulo for id_modulo, _ in modulos_em_ordem(curso)]
+        print(f"\n{COR_TITULO}=== {curso['nome']} — {motor.percentual(nome, id_curso):.0%} ===")
+        if not ordem:
+            print(f"{COR_ALERTA}Nenhum módulo cadastrado{COR_TITULO}")
+        for idx, id_modulo in enumerate(ordem, 1):
+            status = "✅" if concluidos >> int(id_modulo) & 1 else "⬜"
+            print(f"{idx}. {status} {curso['modulos'][id_modulo]['nome']}")
+        print("="*40 + RESET_COR)
+
+        escolha = input("Número do módulo para marcar como concluído (Enter volta): ").strip()
+        if not escolha:
+            return
+        if not (escolha.isdigit() and 1 <= int(escolha) <= len(ordem)):
+            print(f"{COR_ERRO}❌ Opção inválida!{RESET_COR}")
+            continue
+        try:
+            if marcar_modulo(nome, id_curso, ordem[int(escolha) - 1], sessao):
+                print(f"{COR_SUCESSO}✅ Módulo concluído!{RESET_COR}")
+            else:
+                print(f"{COR_ALERTA}⚠️ Módulo já estava concluído{RESET_COR}")
+        except ValueError as e:
+            print(f"{COR_ERRO}❌ {e}{RESET_COR}")
@@ -0,0 +1,493 @@
+import atexit
+import glob
+import gzip
+import json
+import os
+import queue
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from armazenamento.armazenamento import trava_arquivo
+
+
+# ========== CONFIGURAÇÕES ==========
+FORMATO_LOG = os.environ.get("PIM_LOG_FORMATO", "jsonl")  # "jsonl" ou "texto" (formato antigo)
+ARQUIVO_LOG_TEXTO = "registro_logs.log"
+ARQUIVO_LOG_JSONL = "registro_logs.jsonl"
+ARQUIVO_LOG = ARQUIVO_LOG_JSONL if FORMATO_LOG == "jsonl" else ARQUIVO_LOG_TEXTO
+TAMANHO_BLOCO_LEITURA = 64 * 1024  # Bytes lidos por vez ao percorrer o log de trás para frente
+TAMANHO_MAX_LOG = int(os.environ.get("PIM_LOG_TAMANHO_MAX", 10 * 1024 * 1024))  # Bytes; 0 = sem rotação
+TAMANHO_LOTE = 200       # Entradas acumuladas antes de gravar
+INTERVALO_FLUSH = 1.0    # Segundos máximos que uma entrada espera na fila
+DURABILIDADE = os.environ.get("PIM_LOG_DURABILIDADE", "lote")  # "lote", "entrada" ou "nenhuma"
+
+
+# ========== FORMATO DAS ENTRADAS ==========
+def montar_entrada(usuario: str, acao: str, detalhes: str = "", alvo: Optional[str] = None,
+                   momento: Optional[datetime] = None) -> str:
+    """Monta a entrada no formato configurado (uma linha JSON ou o bloco de texto antigo)"""
+    momento = momento or datetime.now()
+    if FORMATO_LOG == "jsonl":
+        return json.dumps({
+            "ts": momento.isoformat(timespec="seconds"),
+            "usuario": usuario,
+            "acao": acao,
+            "alvo": alvo,
+            "detalhes": detalhes
+        }, ensure_ascii=False) + "\n"
+    return (
+        f"[{momento.strftime('%Y-%m-%d %H:%M:%S')}] "
+        f"Usuário: {usuario}\n"
+        f"Ação: {acao}\n"
+        f"Detalhes: {detalhes}\n"
+        f"{'-'*50}\n"
+    )
+
+def formatar_evento(evento: Dict) -> str:
+    """Converte um evento JSONL no bloco legível usado na tela"""
+    return (
+        f"[{evento['ts'].replace('T', ' ')}] Usuário: {evento['usuario']}\n"
+        f"Ação: {evento['acao']}\n"
+        f"Detalhes: {evento['detalhes']}\n"
+        f"{'-'*50}"
+    )
+
+
+# ========== ROTAÇÃO ==========
+def nome_segmento(arquivo: str, momento: Optional[datetime] = None) -> str:
+    """registro_logs.jsonl -> registro_logs.20250522-202809-000000.jsonl"""
+    base, extensao = os.path.splitext(arquivo)
+    return f"{base}.{(momento or datetime.now()).strftime('%Y%m%d-%H%M%S-%f')}{extensao}"
+
+def compactar_segmento(segmento: str) -> str:
+    """Comprime um segmento rotacionado em .gz e apaga o original"""
+    destino = segmento + ".gz"
+    temporario = destino + ".tmp"
+    with open(segmento, 'rb') as origem, gzip.open(temporario, 'wb') as saida:
+        shutil.copyfileobj(origem, saida)
+    os.replace(temporario, destino)
+    os.remove(segmento)
+    return destino
+
+
+# ========== ESCRITOR EM SEGUNDO PLANO ==========
+_DESCARREGAR = object()  # Marcador na fila: grava já o que foi recebido
+
+class EscritorLog:
+    """Fila de entradas gravada em lotes por uma thread, com fsync configurável"""
+
+    def __init__(self, arquivo: str = ARQUIVO_LOG, tamanho_lote: int = TAMANHO_LOTE,
+                 intervalo: float = INTERVALO_FLUSH, durabilidade: str = DURABILIDADE,
+                 tamanho_max: int = TAMANHO_MAX_LOG):
+        self.arquivo = arquivo
+        self.tamanho_max = tamanho_max
+        self.tamanho_lote = tamanho_lote
+        self.intervalo = intervalo
+        self.durabilidade = durabilidade
+        self._fila = queue.Queue()
+        self._thread = None
+        self._trava = threading.Lock()
+
+    def escrever(self, texto: str):
+        """Enfileira a entrada; quem chama não espera o disco"""
+        if self._thread is None:
+            self._iniciar()
+        self._fila.put(texto)
+
+    def descarregar(self):
+        """Bloqueia até tudo que já foi enfileirado estar no arquivo"""
+        if self._thread is not None and self._thread.is_alive():
+            self._fila.put(_DESCARREGAR)  # Fecha o lote atual sem esperar o intervalo
+            self._fila.join()
+
+    def encerrar(self):
+        """Grava o que falta e para a thread (chamado no atexit)"""
+        if self._thread is not None and self._thread.is_alive():
+            self._fila.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _iniciar(self):
+        with self._trava:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._executar, name="escritor-log", daemon=True)
+                self._thread.start()
+
+    def _executar(self):
+        while True:
+            lote = [self._fila.get()]
+            limite = time.monotonic() + self.intervalo
+            # Junta o que chegar até encher o lote ou vencer o intervalo
+            while lote[-1] is not None and lote[-1] is not _DESCARREGAR and len(lote) < self.tamanho_lote:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(self._fila.get(timeout=restante))
+                except queue.Empty:
+                    break
+
+            encerrar = lote[-1] is None
+            entradas = [texto for texto in lote if isinstance(texto, str)]
+            try:
+                if entradas:
+                    self._gravar(entradas)
+            except Exception as e:  # Qualquer erro perde só o lote: a thread continua viva
+                print(f"⚠️ Falha ao gravar log: {e}")
+            finally:
+                for _ in lote:
+                    self._fila.task_done()
+            if encerrar:
+                return
+
+    def _gravar(self, entradas: list):
+        self._rotacionar_se_preciso()
+        # Trava compartilhada: vários processos anexam juntos, só a rotação é exclusiva
+        with trava_arquivo(self.arquivo, compartilhada=True), \
+                open(self.arquivo, 'a', encoding='utf-8') as f:
+            if self.durabilidade == "entrada":
+                for texto in entradas:
+                    f.write(texto)
+                    f.flush()
+                    os.fsync(f.fileno())
+                return
+            f.write("".join(entradas))
+            if self.durabilidade == "lote":
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _rotacionar_se_preciso(self):
+        """Renomeia o log para um segmento datado quando passa do tamanho máximo e o comprime"""
+        if not self.tamanho_max or self._tamanho() < self.tamanho_max:
+            return
+        with trava_arquivo(self.arquivo):
+            if self._tamanho() < self.tamanho_max:
+                return  # Outro processo acabou de rotacionar
+            segmento = nome_segmento(self.arquivo)
+            os.replace(self.arquivo, segmento)
+        compactar_segmento(segmento)
+
+    def _tamanho(self) -> int:
+        try:
+            return os.path.getsize(self.arquivo)
+        except FileNotFoundError:
+            return 0
+
+
+_escritor = EscritorLog()
+atexit.register(_escritor.encerrar)
+
+def registrar_evento(usuario: str, acao: str, detalhes: str = "", alvo: Optional[str] = None):
+    """Formata e enfileira um evento do log de atividades"""
+    _escritor.escrever(montar_entrada(usuario, acao, detalhes, alvo))
+
+def descarregar_logs():
+    """Garante que as entradas pendentes estejam no arquivo (antes de lê-lo)"""
+    _escritor.descarregar()
+
+
+# ========== CONVERSÃO DO FORMATO ANTIGO ==========
+PADRAO_CABECALHO = re.compile(r"^\[(.+?)\] Usuário: (.*)$")
+PADRAO_ALVO = re.compile(r"(?:Usuário|Aluno|ID): ([^|]+)")
+
+def ler_log_texto(arquivo: str = ARQUIVO_LOG_TEXTO) -> Iterator[Dict]:
+    """Lê os blocos do log antigo (cabeçalho, Ação, Detalhes, tracejado) como eventos"""
+    evento = None
+    with open(arquivo, 'r', encoding='utf-8') as f:
+        for linha in f:
+            linha = linha.rstrip("\r\n")
+            if cabecalho := PADRAO_CABECALHO.match(linha):
+                momento = datetime.strptime(cabecalho.group(1), '%Y-%m-%d %H:%M:%S')
+                evento = {"ts": momento.isoformat(timespec="seconds"), "usuario": cabecalho.group(2),
+                          "acao": "", "alvo": None, "detalhes": ""}
+            elif evento is None:
+                continue
+            elif linha.startswith("Ação: "):
+                evento["acao"] = linha[len("Ação: "):]
+            elif linha.startswith("Detalhes: "):
+                evento["detalhes"] = linha[len("Detalhes: "):]
+                if alvo := PADRAO_ALVO.search(evento["detalhes"]):
+                    evento["alvo"] = alvo.group(1).strip()
+            elif linha.startswith("-----"):
+                yield evento
+                evento = None
+
+def converter_log_texto(origem: str = ARQUIVO_LOG_TEXTO, destino: str = ARQUIVO_LOG_JSONL,
+                        so_se_ausente: bool = False) -> int:
+    """Converte o log antigo para JSONL, antes das entradas que o destino já tiver.
+
+    Segura a trava do destino do começo ao fim: nada é anexado durante a cópia.
+    """
+    with trava_arquivo(destino):
+        if so_se_ausente and os.path.exists(destino):
+            return 0  # Outro processo converteu primeiro
+        fd, temporario = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(destino)),
+                                          prefix=".tmp-", suffix=".jsonl")
+        total = 0
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as saida:
+                for evento in ler_log_texto(origem):
+                    saida.write(json.dumps(evento, ensure_ascii=False) + "\n")
+                    total += 1
+                if os.path.exists(destino):
+                    with open(destino, 'r', encoding='utf-8') as existente:
+                        shutil.copyfileobj(existente, saida)
+            os.replace(temporario, destino)
+        except BaseException:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+    return total
+
+def migrar_log_texto() -> int:
+    """Primeira execução em JSONL com só o log antigo no disco: converte o histórico"""
+    if FORMATO_LOG != "jsonl" or os.path.exists(ARQUIVO_LOG_JSONL) or not os.path.exists(ARQUIVO_LOG_TEXTO):
+        return 0
+    try:
+        return converter_log_texto(so_se_ausente=True)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Falha ao converter {ARQUIVO_LOG_TEXTO}: {e}")
+        return 0
+
+migrar_log_texto()
+
+
+# ========== CONSULTAS INDEXADAS ==========
+def segmentos_log(arquivo: str = ARQUIVO_LOG_JSONL) -> List[str]:
+    """Segmentos rotacionados (.gz) em ordem cronológica"""
+    base, extensao = os.path.splitext(arquivo)
+    return sorted(glob.glob(f"{glob.escape(base)}.*{extensao}.gz"))
+
+
+class IndiceLog:
+    """Índice lateral do log JSONL.
+
+    Segmentos .gz: período coberto e usuários presentes, para pular o segmento inteiro.
+    Arquivo ativo: offsets de cada usuário (autor ou alvo) e do primeiro evento de cada dia.
+    """
+
+    def __init__(self, arquivo: str = ARQUIVO_LOG_JSONL, arquivo_indice: Optional[str] = None):
+        self.arquivo = arquivo
+        self.arquivo_indice = arquivo_indice or arquivo + ".idx"
+        self.pasta = os.path.dirname(os.path.abspath(arquivo))
+        self.segmentos: Dict = {}
+        self.ativo = self._ativo_vazio()
+        self._carregar()
+
+    @staticmethod
+    def _ativo_vazio() -> Dict:
+        return {"id": None, "indexado": 0, "usuarios": {}, "dias": {}}
+
+    def _carregar(self):
+        try:
+            with open(self.arquivo_indice, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return  # Sem índice (ou corrompido): reconstrói na próxima atualização
+        self.segmentos = dados["segmentos"]
+        self.ativo = dados["ativo"]
+
+    def _salvar(self):
+        """Temporário único + os.replace sob a trava do log: processos não se atropelam"""
+        with trava_arquivo(self.arquivo):
+            fd, temporario = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.arquivo_indice)),
+                                              prefix=".tmp-", suffix=".idx")
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({"segmentos": self.segmentos, "ativo": self.ativo}, f, ensure_ascii=False)
+                os.replace(temporario, self.arquivo_indice)
+            except BaseException:
+                if os.path.exists(temporario):
+                    os.remove(temporario)
+                raise
+
+    def atualizar(self):
+        """Indexa segmentos novos e o que foi anexado ao arquivo ativo desde a última vez"""
+        mudou = False
+        existentes = {os.path.basename(segmento) for segmento in segmentos_log(self.arquivo)}
+        for nome in existentes - self.segmentos.keys():
+            self.segmentos[nome] = self._resumir_segmento(nome)
+            mudou = True
+        for nome in self.segmentos.keys() - existentes:
+            del self.segmentos[nome]
+            mudou = True
+        if self._indexar_ativo() or mudou:
+            self._salvar()
+
+    def _resumir_segmento(self, nome: str) -> Dict:
+        resumo = {"inicio": None, "fim": None, "usuarios": set()}
+        for evento in self._ler_segmento(nome):
+            resumo["inicio"] = resumo["inicio"] or evento["ts"]
+            resumo["fim"] = evento["ts"]
+            resumo["usuarios"].update(filter(None, (evento.get("usuario"), evento.get("alvo"))))
+        resumo["usuarios"] = sorted(resumo["usuarios"])
+        return resumo
+
+    def _ler_segmento(self, nome: str) -> Iterator[Dict]:
+        with gzip.open(os.path.join(self.pasta, nome), 'rt', encoding='utf-8') as f:
+            for linha in f:
+                yield json.loads(linha)
+
+    def _indexar_ativo(self) -> bool:
+        try:
+            info = os.stat(self.arquivo)
+        except FileNotFoundError:
+            return False
+        identidade = [info.st_ino, info.st_dev]
+        # Arquivo novo (rotacionou) ou truncado: indexa do zero
+        if self.ativo["id"] != identidade or info.st_size < self.ativo["indexado"]:
+            self.ativo = self._ativo_vazio()
+            self.ativo["id"] = identidade
+        if info.st_size == self.ativo["indexado"]:
+            return False
+
+        usuarios, dias = self.ativo["usuarios"], self.ativo["dias"]
+        offset = self.ativo["indexado"]
+        with open(self.arquivo, 'rb') as f:
+            f.seek(offset)
+            for linha in f:
+                if not linha.endswith(b"\n"):
+                    break  # Entrada ainda sendo gravada por outro processo
+                try:
+                    evento = json.loads(linha)
+                except ValueError:
+                    offset += len(linha)
+                    continue
+                for nome in {evento.get("usuario"), evento.get("alvo")} - {None}:
+                    usuarios.setdefault(nome, []).append(offset)
+                dias.setdefault(evento["ts"][:10], offset)
+                offset += len(linha)
+        self.ativo["indexado"] = offset
+        return True
+
+    def eventos_do_usuario(self, nome: str) -> Iterator[Dict]:
+        """Todos os eventos em que o usuário é autor ou alvo, do mais antigo ao mais novo"""
+        self.atualizar()
+        for segmento, resumo in sorted(self.segmentos.items()):
+            if nome in resumo["usuarios"]:
+                for evento in self._ler_segmento(segmento):
+                    if nome in (evento.get("usuario"), evento.get("alvo")):
+                        yield evento
+
+        offsets = self.ativo["usuarios"].get(nome, [])
+        if offsets:
+            with open(self.arquivo, 'rb') as f:
+                for offset in offsets:
+                    f.seek(offset)
+                    yield json.loads(f.readline())
+
+    def eventos_desde(self, momento: datetime) -> Iterator[Dict]:
+        """Eventos a partir do momento, lendo só segmentos e dias que podem contê-los"""
+        self.atualizar()
+        limite = momento.isoformat(timespec="seconds")
+        for segmento, resumo in sorted(self.segmentos.items()):
+            if resumo["fim"] and resumo["fim"] >= limite:
+                for evento in self._ler_segmento(segmento):
+                    if evento["ts"] >= limite:
+                        yield evento
+
+        inicios = [offset for dia, offset in self.ativo["dias"].items() if dia >= limite[:10]]
+        if inicios:
+            with open(self.arquivo, 'rb') as f:
+                f.seek(min(inicios))
+                restante = self.ativo["indexado"] - min(inicios)
+                for linha in f:
+                    restante -= len(linha)
+                    if restante < 0:
+                        break
+                    evento = json.loads(linha)
+                    if evento["ts"] >= limite:
+                        yield evento
+
+
+_indice_log = None
+
+def _get_indice_log() -> IndiceLog:
+    global _indice_log
+    if _indice_log is None:
+        _indice_log = IndiceLog()
+    return _indice_log
+
+def eventos_do_usuario(nome: str) -> Iterator[Dict]:
+    """Eventos do usuário (autor ou alvo), em ordem, como gerador"""
+    descarregar_logs()
+    if FORMATO_LOG != "jsonl":
+        return (e for e in ler_log_texto(ARQUIVO_LOG) if nome in (e["usuario"], e["alvo"]))
+    return _get_indice_log().eventos_do_usuario(nome)
+
+def eventos_desde(momento: datetime) -> Iterator[Dict]:
+    """Eventos a partir do momento informado, em ordem, como gerador"""
+    descarregar_logs()
+    if FORMATO_LOG != "jsonl":
+        limite = momento.isoformat(timespec="seconds")
+        return (e for e in ler_log_texto(ARQUIVO_LOG) if e["ts"] >= limite)
+    return _get_indice_log().eventos_desde(momento)
+
+
+# ========== LEITURA A PARTIR DO FIM ==========
+def linhas_do_fim(arquivo: str, tamanho_bloco: int = TAMANHO_BLOCO_LEITURA) -> Iterator[bytes]:
+    """Linhas do arquivo da última para a primeira, lendo blocos de trás para frente"""
+    with open(arquivo, 'rb') as f:
+        posicao = f.seek(0, os.SEEK_END)
+        resto = b""
+        while posicao > 0:
+            leitura = min(tamanho_bloco, posicao)
+            posicao -= leitura
+            f.seek(posicao)
+            linhas = (f.read(leitura) + resto).split(b"\n")
+            resto = linhas.pop(0)  # Pode ser o fim de uma linha que começa no bloco anterior
+            for linha in reversed(linhas):
+                if linha.strip():
+                    yield linha
+        if resto.strip():
+            yield resto
+
+def entradas_do_fim(arquivo: str = ARQUIVO_LOG) -> Iterator[str]:
+    """Entradas já formatadas para a tela, da mais nova para a mais antiga"""
+    if FORMATO_LOG == "jsonl":
+        for linha in linhas_do_fim(arquivo):
+            yield formatar_evento(json.loads(linha))
+        return
+
+    bloco = []  # Formato texto: junta as linhas até achar o cabeçalho da entrada
+    for linha in linhas_do_fim(arquivo):
+        texto = linha.decode('utf-8').rstrip("\r")
+        bloco.append(texto)
+        if PADRAO_CABECALHO.match(texto):
+            yield "\n".join(reversed(bloco))
+            bloco = []
+
+def acompanhar_log(arquivo: str = ARQUIVO_LOG, intervalo: float = 1.0) -> Iterator[str]:
+    """Segue o fim do log (como tail -f), entregando cada linha nova já formatada"""
+    posicao = os.path.getsize(arquivo) if os.path.exists(arquivo) else 0
+    while True:
+        descarregar_logs()
+        tamanho = os.path.getsize(arquivo) if os.path.exists(arquivo) else 0
+        if tamanho < posicao:
+            posicao = 0  # O log rotacionou: começa o arquivo novo do início
+        if tamanho > posicao:
+            with open(arquivo, 'rb') as f:
+                f.seek(posicao)
+                for linha in f:
+                    if not linha.endswith(b"\n"):
+                        break  # Linha ainda sendo gravada: pega na próxima volta
+                    posicao += len(linha)
+                    if FORMATO_LOG == "jsonl":
+                        yield formatar_evento(json.loads(linha))
+                    else:
+                        yield linha.decode('utf-8').rstrip("\r\n")
+        time.sleep(intervalo)
+
+
+if __name__ == "__main__":
+    # Uso: python -m logs.logs converter [registro_logs.log] [registro_logs.jsonl]
+    if len(sys.argv) >= 2 and sys.argv[1] == "converter":
+        convertidos = converter_log_texto(*sys.argv[2:4])
+        print(f"✅ {convertidos} entradas convertidas")
+    else:
+        print("Uso: python -m logs.logs converter [origem.log] [destino.jsonl]")
@@ -1,8 +1,10 @@
 import json
 import os
 from datetime import datetime
+from typing import Optional
 from usuarios.usuarios import get_usuario_logado, eh_admin, registrar_log
 from cursos.cursos import cursos_disponiveis, salvar_cursos
+from cursos.estrutura import modulos_em_ordem, incluir_modulo, excluir_modulo, mover_modulo
 
 
 # ========== CONFIGURAÇÕES ==========
@@ -19,14 +21,14 @@ ERRO_MODULO_NAO_ENCONTRADO = f"{COR_ERRO}❌ Módulo não encontrado!{RESET_COR}
 
 
 # ========== FUNÇÕES PRINCIPAIS ==========
-def tela_modulos():
+def tela_modulos(sessao: Optional[str] = None):
     """Menu principal de módulos"""
-    if not get_usuario_logado:
+    if not get_usuario_logado(sessao):
         print(f"{COR_ERRO}⚠️ Faça login primeiro!{RESET_COR}")
         input("Pressione Enter para voltar...")
         return
     
-    if not eh_admin():
+    if not eh_admin(sessao):
         print(ERRO_PERMISSAO)
         input("Pressione Enter para voltar...")
         return
@@ -37,6 +39,7 @@ def tela_modulos():
         print("2. ➕ Adicionar módulo")
         print("3. ✏️ Editar módulo")
         print("4. 🗑️ Remover módulo")
+        print("5. ↕️ Reordenar módulo")
         print("0. ↩ Voltar")
         print("="*40 + RESET_COR)
         
@@ -45,18 +48,20 @@ def tela_modulos():
         if escolha == '1':
             listar_modulos_por_curso()
         elif escolha == '2':
-            adicionar_modulo()
+            adicionar_modulo(sessao)
         elif escolha == '3':
-            editar_modulo()
+            editar_modulo(sessao)
         elif escolha == '4':
-            remover_modulo()
+            remover_modulo(sessao)
+        elif escolha == '5':
+            reordenar_modulo(sessao)
         elif escolha == '0':
             break
         else:
             print(f"{COR_ERRO}❌ Opção inválida!{RESET_COR}")
 
 # ========== OPERAÇÕES DE MÓDULOS ==========
-def adicionar_modulo():
+def adicionar_modulo(sessao: Optional[str] = None):
     """Adiciona novo módulo a um curso existente"""
     print(f"\n{COR_TITULO}=== ADICIONAR MÓDULO ===")
     
@@ -78,45 +83,45 @@ def adicionar_modulo():
     try:
         novo_modulo = {
             "nome": nome_modulo,
-            "criado_por": get_usuario_logado()["nome"],  
+            "criado_por": get_usuario_logado(sessao)["nome"],
             "data_criacao": datetime.now().isoformat(),
             "aulas": []
         }
         
-        cursos_disponiveis[id_curso]["modulos"].append(novo_modulo)
-        salvar_cursos()
+        incluir_modulo(cursos_disponiveis[id_curso], novo_modulo)
+        salvar_cursos(id_curso)
         
         registrar_log("Módulo adicionado",  # Corrigido: usa registrar_log padrão
-                    f"Curso: {cursos_disponiveis[id_curso]['nome']} | Módulo: {nome_modulo}")
+                    f"Curso: {cursos_disponiveis[id_curso]['nome']} | Módulo: {nome_modulo}", alvo=id_curso, sessao=sessao)
         print(f"\n{COR_SUCESSO}✅ Módulo adicionado com sucesso!{RESET_COR}")
     except Exception as e:
         print(f"{COR_ERRO}❌ Erro ao adicionar módulo: {e}{RESET_COR}")
     finally:
         input("Pressione Enter para voltar...")
 
-def editar_modulo():
+def editar_modulo(sessao: Optional[str] = None):
     """Edita um módulo existente"""
     print(f"\n{COR_TITULO}=== EDITAR MÓDULO ===")
     
-    id_curso, idx_modulo = selecionar_modulo()
+    id_curso, id_modulo = selecionar_modulo()
     if id_curso is None:
         return
     
     try:
-        modulo = cursos_disponiveis[id_curso]["modulos"][idx_modulo]
+        modulo = cursos_disponiveis[id_curso]["modulos"][id_modulo]
         print(f"\nEditando: {modulo['nome']}")
         print("Deixe em branco para manter o valor atual\n")
         
         novo_nome = input(f"Novo nome [{modulo['nome']}]: ").strip()
         
         if novo_nome:
-            cursos_disponiveis[id_curso]["modulos"][idx_modulo]["nome"] = novo_nome
-            cursos_disponiveis[id_curso]["modulos"][idx_modulo]["ultima_edicao"] = {
-                "por": get_usuario_logado["nome"],
+            modulo["nome"] = novo_nome
+            modulo["ultima_edicao"] = {
+                "por": get_usuario_logado(sessao)["nome"],
                 "em": datetime.now().isoformat()
             }
-            salvar_cursos()
-            registrar_log()("Módulo editado", f"ID Curso: {id_curso} | Novo nome: {novo_nome}")
+            salvar_cursos(id_curso)
+            registrar_log("Módulo editado", f"ID Curso: {id_curso} | Novo nome: {novo_nome}", alvo=id_curso, sessao=sessao)
             print(f"\n{COR_SUCESSO}✅ Módulo atualizado!{RESET_COR}")
         else:
             print(f"{COR_ALERTA}⚠️ Nenhuma alteração realizada.{RESET_COR}")
@@ -125,23 +130,23 @@ def editar_modulo():
     finally:
         input("Pressione Enter para voltar...")
 
-def remover_modulo():
+def remover_modulo(sessao: Optional[str] = None):
     """Remove um módulo de um curso"""
     print(f"\n{COR_TITULO}=== REMOVER MÓDULO ===")
     
-    id_curso, idx_modulo = selecionar_modulo()
+    id_curso, id_modulo = selecionar_modulo()
     if id_curso is None:
         return
     
     try:
-        modulo = cursos_disponiveis[id_curso]["modulos"][idx_modulo]
+        modulo = cursos_disponiveis[id_curso]["modulos"][id_modulo]
         confirmacao = input(f"\nTem certeza que deseja remover '{modulo['nome']}'? (S/N): ").upper()
         
         if confirmacao == 'S':
-            modulo_removido = cursos_disponiveis[id_curso]["modulos"].pop(idx_modulo)
-            salvar_cursos()
-            registrar_log()("Módulo removido", 
-                         f"Curso: {cursos_disponiveis[id_curso]['nome']} | Módulo: {modulo_removido['nome']}")
+            modulo_removido = excluir_modulo(cursos_disponiveis[id_curso], id_modulo)
+            salvar_cursos(id_curso)
+            registrar_log("Módulo removido", 
+                         f"Curso: {cursos_disponiveis[id_curso]['nome']} | Módulo: {modulo_removido['nome']}", alvo=id_curso, sessao=sessao)
             print(f"\n{COR_SUCESSO}✅ Módulo removido com sucesso!{RESET_COR}")
         else:
             print(f"{COR_ALERTA}❌ Operação cancelada.{RESET_COR}")
@@ -150,6 +155,29 @@ def remover_modulo():
     finally:
         input("Pressione Enter para voltar...")
 
+def reordenar_modulo(sessao: Optional[str] = None):
+    """Muda a posição de um módulo; o ID (e o progresso dos alunos) continua o mesmo"""
+    print(f"\n{COR_TITULO}=== REORDENAR MÓDULO ===")
+    
+    id_curso, id_modulo = selecionar_modulo()
+    if id_curso is None:
+        return
+    
+    try:
+        curso = cursos_disponiveis[id_curso]
+        posicao = int(input(f"Nova posição (1 a {len(curso['ordem_modulos'])}): "))
+        mover_modulo(curso, id_modulo, posicao)
+        salvar_cursos(id_curso)
+        registrar_log("Módulo reordenado",
+                     f"Curso: {curso['nome']} | Módulo: {curso['modulos'][id_modulo]['nome']} | Posição: {posicao}", alvo=id_curso, sessao=sessao)
+        print(f"\n{COR_SUCESSO}✅ Ordem atualizada!{RESET_COR}")
+    except ValueError:
+        print(f"{COR_ERRO}❌ Digite um número válido!{RESET_COR}")
+    except Exception as e:
+        print(f"{COR_ERRO}❌ Erro ao reordenar módulo: {e}{RESET_COR}")
+    finally:
+        input("Pressione Enter para voltar...")
+
 # ========== FUNÇÕES AUXILIARES ==========
 def listar_modulos_por_curso():
     """Lista todos os módulos organizados por curso"""
@@ -157,7 +185,7 @@ def listar_modulos_por_curso():
         print(f"\n{COR_TITULO}=== MÓDULOS POR CURSO ===")
         for id_curso, curso in cursos_disponiveis.items():
             print(f"\n📚 {curso['nome']} ({len(curso['modulos'])} módulos):")
-            for idx, modulo in enumerate(curso["modulos"], 1):
+            for idx, (_, modulo) in enumerate(modulos_em_ordem(curso), 1):
                 print(f"   {idx}. {modulo['nome']}")
                 print(f"      Criado por: {modulo['criado_por']}")
                 print(f"      Data: {modulo['data_criacao'][:10]}")
@@ -184,14 +212,15 @@ def selecionar_modulo():
             return None, None
         
         print(f"\nMódulos disponíveis em {cursos_disponiveis[id_curso]['nome']}:")
-        for idx, modulo in enumerate(cursos_disponiveis[id_curso]["modulos"], 1):
-            print(f"{idx}. {modulo['nome']}")
+        ordem = [id_modulo for id_modulo, _ in modulos_em_ordem(cursos_disponiveis[id_curso])]
+        for idx, id_modulo in enumerate(ordem, 1):
+            print(f"{idx}. {cursos_disponiveis[id_curso]['modulos'][id_modulo]['nome']}")
         
         idx_modulo = int(input("\nNúmero do módulo: ")) - 1
-        if idx_modulo < 0 or idx_modulo >= len(cursos_disponiveis[id_curso]["modulos"]):
+        if idx_modulo < 0 or idx_modulo >= len(ordem):
             raise ValueError("Índice inválido")
             
-        return id_curso, idx_modulo
+        return id_curso, ordem[idx_modulo]  # ID estável, não a posição
         
     except ValueError:
         print(f"{COR_ERRO}❌ Digite um número válido da lista!{RESET_COR}")
@@ -0,0 +1,141 @@
+import os
+import socket
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+# ========== CONFIGURAÇÕES ==========
+JANELA_FALHAS = 60              # Segundos considerados em "falhas por minuto"
+LIMITE_FALHAS_USUARIO = 5       # Falhas na janela para alertar sobre um usuário
+LIMITE_FALHAS_ORIGEM = 10       # Falhas na janela para alertar sobre uma origem
+JANELA_NOMES = 300              # Segundos considerados na rajada de nomes diferentes
+LIMITE_NOMES_ORIGEM = 5         # Nomes distintos tentados pela mesma origem na janela
+HORAS_INCOMUNS = range(0, 6)    # Logins bem-sucedidos entre 0h e 5h59
+MAX_CHAVES = 10_000             # Usuários/origens acompanhados (os menos recentes saem)
+MAX_ALERTAS = 200               # Alertas guardados para o relatório
+
+
+# ========== JANELAS DESLIZANTES ==========
+class JanelaDeslizante:
+    """Contador de eventos na janela com baldes fixos: O(1) por evento, memória constante"""
+
+    def __init__(self, duracao: float, baldes: int = 12):
+        self.largura = duracao / baldes
+        self.fatias = [0] * baldes
+        self.contagens = [0] * baldes
+
+    def registrar(self, agora: float) -> int:
+        """Conta um evento e devolve o total na janela"""
+        fatia = int(agora // self.largura)
+        i = fatia % len(self.fatias)
+        if self.fatias[i] != fatia:
+            self.fatias[i] = fatia
+            self.contagens[i] = 0
+        self.contagens[i] += 1
+        return self.total(agora)
+
+    def total(self, agora: float) -> int:
+        atual = int(agora // self.largura)
+        return sum(c for f, c in zip(self.fatias, self.contagens)
+                   if atual - f < len(self.fatias))
+
+
+class NomesRecentes:
+    """Nomes distintos vistos na janela, limitado aos 'capacidade' mais recentes"""
+
+    def __init__(self, duracao: float, capacidade: int = 32):
+        self.duracao = duracao
+        self.capacidade = capacidade
+        self.vistos = OrderedDict()
+
+    def registrar(self, nome: str, agora: float) -> int:
+        """Registra o nome e devolve quantos nomes distintos apareceram na janela"""
+        self.vistos[nome] = agora
+        self.vistos.move_to_end(nome)
+        while len(self.vistos) > self.capacidade:
+            self.vistos.popitem(last=False)
+        # Os mais antigos ficam no começo: descarta os que saíram da janela
+        while self.vistos and next(iter(self.vistos.values())) < agora - self.duracao:
+            self.vistos.popitem(last=False)
+        return len(self.vistos)
+
+
+# ========== DETECTOR ==========
+def origem_sessao() -> str:
+    """Identifica de onde vem a sessão do terminal (IP do SSH ou máquina + tty)"""
+    if ssh := os.environ.get("SSH_CLIENT"):
+        return ssh.split()[0]
+    try:
+        terminal = os.ttyname(0)
+    except (OSError, AttributeError):
+        terminal = "console"
+    return f"{socket.gethostname()}:{terminal}"
+
+
+class DetectorAcessos:
+    """Analisa cada tentativa de login assim que ela acontece, sem reler o log"""
+
+    def __init__(self):
+        self.falhas_usuario = OrderedDict()   # usuário -> JanelaDeslizante
+        self.falhas_origem = OrderedDict()    # origem -> JanelaDeslizante
+        self.nomes_origem = OrderedDict()     # origem -> NomesRecentes
+        self.alertas = deque(maxlen=MAX_ALERTAS)
+        self.tentativas = 0
+        self.falhas = 0
+
+    @staticmethod
+    def _estado(mapa: OrderedDict, chave: str, criar):
+        """Busca o estado da chave (criando se preciso) e descarta o menos recente se lotar"""
+        if chave in mapa:
+            mapa.move_to_end(chave)
+            return mapa[chave]
+        estado = mapa[chave] = criar()
+        if len(mapa) > MAX_CHAVES:
+            mapa.popitem(last=False)
+        return estado
+
+    def registrar_tentativa(self, usuario: str, origem: str, sucesso: bool,
+                            agora: Optional[float] = None) -> List[Dict]:
+        """Processa uma tentativa e devolve os alertas que ela disparou"""
+        agora = time.time() if agora is None else agora
+        self.tentativas += 1
+        alertas = []
+
+        nomes = self._estado(self.nomes_origem, origem, lambda: NomesRecentes(JANELA_NOMES))
+        if nomes.registrar(usuario, agora) == LIMITE_NOMES_ORIGEM:
+            alertas.append(self._alerta(agora, "Rajada de usuários", origem,
+                                        f"{LIMITE_NOMES_ORIGEM} nomes diferentes em {JANELA_NOMES // 60} min"))
+
+        if sucesso:
+            hora = datetime.fromtimestamp(agora).hour
+            if hora in HORAS_INCOMUNS:
+                alertas.append(self._alerta(agora, "Horário incomum", usuario, f"Login às {hora}h de {origem}"))
+            return alertas
+
+        self.falhas += 1
+        janela = self._estado(self.falhas_usuario, usuario, lambda: JanelaDeslizante(JANELA_FALHAS))
+        if janela.registrar(agora) == LIMITE_FALHAS_USUARIO:
+            alertas.append(self._alerta(agora, "Falhas repetidas", usuario,
+                                        f"{LIMITE_FALHAS_USUARIO} senhas erradas em {JANELA_FALHAS}s"))
+        janela = self._estado(self.falhas_origem, origem, lambda: JanelaDeslizante(JANELA_FALHAS))
+        if janela.registrar(agora) == LIMITE_FALHAS_ORIGEM:
+            alertas.append(self._alerta(agora, "Falhas por origem", origem,
+                                        f"{LIMITE_FALHAS_ORIGEM} falhas em {JANELA_FALHAS}s"))
+        return alertas
+
+    def _alerta(self, agora: float, tipo: str, chave: str, detalhes: str) -> Dict:
+        alerta = {"ts": datetime.fromtimestamp(agora).isoformat(timespec="seconds"),
+                  "tipo": tipo, "chave": chave, "detalhes": detalhes}
+        self.alertas.append(alerta)
+        return alerta
+
+    def maiores_falhas(self, quantidade: int = 5, agora: Optional[float] = None) -> List[tuple]:
+        """Usuários com mais falhas na janela atual"""
+        agora = time.time() if agora is None else agora
+        totais = ((usuario, janela.total(agora)) for usuario, janela in self.falhas_usuario.items())
+        return sorted((t for t in totais if t[1]), key=lambda t: -t[1])[:quantidade]
+
+
+detector_acessos = DetectorAcessos()
@@ -0,0 +1,168 @@
+import atexit
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from armazenamento.armazenamento import trava_arquivo, _gravar_json_atomico
+
+
+# ========== CONFIGURAÇÕES ==========
+CAPACIDADE_USUARIO = 5          # Tentativas seguidas permitidas por usuário
+RECARGA_USUARIO = 1 / 20        # Fichas por segundo (1 tentativa a cada 20s)
+CAPACIDADE_GLOBAL = 50          # Rajada máxima somando todos os usuários
+RECARGA_GLOBAL = 10.0           # Tentativas por segundo no processo inteiro
+FALHAS_PARA_BLOQUEIO = 5        # Falhas seguidas até o primeiro bloqueio
+BLOQUEIO_BASE = 60              # Segundos do primeiro bloqueio (dobra a cada falha extra)
+BLOQUEIO_MAX = 3600
+TTL_ESTADO = 3600               # Estado sem uso por mais que isso é descartado
+MAX_ESTADOS = 10_000            # Usuários acompanhados (os usados há mais tempo saem)
+ARQUIVO_LIMITADOR = "limitador_login.json"
+PERSISTIR = os.environ.get("PIM_LIMITADOR_PERSISTIR", "1") == "1"
+
+
+class LimitadorLogin:
+    """Token bucket por usuário e global, com bloqueio exponencial após falhas seguidas.
+
+    Estado por usuário: [fichas, última atualização, falhas seguidas, bloqueado até].
+    """
+
+    def __init__(self, arquivo: Optional[str] = ARQUIVO_LIMITADOR):
+        self.arquivo = arquivo
+        self.usuarios = OrderedDict()  # Ordem = último uso, para expirar pelo começo
+        self.global_ = [CAPACIDADE_GLOBAL, time.time()]
+        self._alterado = False
+        self._disco: Dict[str, list] = {}  # Última leitura do arquivo (outros processos gravam nele)
+        self._zerados = set()              # Acertaram a senha: a contagem zerada vence a do arquivo
+        self._mtime_disco = None
+        if arquivo:
+            self._carregar()
+
+    @staticmethod
+    def _recarregar(balde: list, capacidade: float, taxa: float, agora: float):
+        balde[0] = min(capacidade, balde[0] + max(0.0, agora - balde[1]) * taxa)
+        balde[1] = agora
+
+    def _expirar(self, agora: float):
+        while self.usuarios:
+            usuario, estado = next(iter(self.usuarios.items()))
+            if estado[1] > agora - TTL_ESTADO or estado[3] > agora:
+                break
+            del self.usuarios[usuario]
+
+    def verificar(self, usuario: str, agora: Optional[float] = None) -> Optional[float]:
+        """Consome uma ficha; devolve os segundos de espera se a tentativa deve ser recusada"""
+        agora = time.time() if agora is None else agora
+        self._expirar(agora)
+
+        estado = self.usuarios.get(usuario)
+        if estado is None and (salvo := self._estado_disco(usuario)) is not None:
+            # Falhas e bloqueio gravados por outro processo (ou antes de um reinício)
+            estado = self._acompanhar(usuario, list(salvo))
+        if estado is not None:
+            self.usuarios.move_to_end(usuario)
+            if estado[3] > agora:
+                return estado[3] - agora
+
+        # Balde global antes de criar estado: nomes aleatórios recusados não ocupam memória
+        self._recarregar(self.global_, CAPACIDADE_GLOBAL, RECARGA_GLOBAL, agora)
+        if self.global_[0] < 1:
+            return (1 - self.global_[0]) / RECARGA_GLOBAL
+        if estado is None:
+            estado = self._acompanhar(usuario, [CAPACIDADE_USUARIO, agora, 0, 0.0])
+        self._recarregar(estado, CAPACIDADE_USUARIO, RECARGA_USUARIO, agora)
+        if estado[0] < 1:
+            return (1 - estado[0]) / RECARGA_USUARIO
+
+        estado[0] -= 1
+        self.global_[0] -= 1
+        self._alterado = True  # Fichas gastas também sobrevivem a um reinício
+        return None
+
+    def _acompanhar(self, usuario: str, estado: list) -> list:
+        self.usuarios[usuario] = estado
+        while len(self.usuarios) > MAX_ESTADOS:
+            self.usuarios.popitem(last=False)
+        return estado
+
+    def registrar_resultado(self, usuario: str, sucesso: bool, agora: Optional[float] = None):
+        """Zera as falhas num acerto; bloqueia (com espera dobrando) a partir de N falhas seguidas"""
+        agora = time.time() if agora is None else agora
+        estado = self.usuarios.get(usuario)
+        if estado is None:
+            return
+        if sucesso:
+            self._alterado |= estado[2] > 0
+            estado[2] = 0
+            self._zerados.add(usuario)
+            return
+        estado[2] += 1
+        self._zerados.discard(usuario)
+        self._alterado = True
+        if estado[2] >= FALHAS_PARA_BLOQUEIO:
+            espera = min(BLOQUEIO_BASE * 2 ** (estado[2] - FALHAS_PARA_BLOQUEIO), BLOQUEIO_MAX)
+            estado[3] = agora + espera
+        # Toda falha vai para o disco: reiniciar o processo não zera a contagem
+        self.salvar()
+
+    # ----- Persistência -----
+    def _ler_disco(self) -> Dict[str, list]:
+        try:
+            with open(self.arquivo, 'r', encoding='utf-8') as f:
+                estados = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return {u: e for u, e in estados.items() if isinstance(e, list) and len(e) == 4}
+
+    def _estado_disco(self, usuario: str) -> Optional[list]:
+        """Estado gravado para o usuário, relendo o arquivo só quando ele mudou"""
+        if not (self.arquivo and PERSISTIR):
+            return None
+        try:
+            mtime = os.stat(self.arquivo).st_mtime_ns
+        except OSError:
+            return None
+        if mtime != self._mtime_disco:
+            with trava_arquivo(self.arquivo, compartilhada=True):
+                self._disco = self._ler_disco()
+            self._mtime_disco = mtime
+        return self._disco.get(usuario)
+
+    def _carregar(self):
+        agora = time.time()
+        estados = sorted(self._ler_disco().items(), key=lambda item: item[1][1])  # Mais antigos primeiro
+        self.usuarios = OrderedDict(estados[-MAX_ESTADOS:])
+        self._expirar(agora)
+
+    @staticmethod
+    def _mesclar(meu: list, outro: list) -> list:
+        """Combina dois estados do mesmo usuário ficando com o mais restritivo"""
+        return [min(meu[0], outro[0]), max(meu[1], outro[1]), max(meu[2], outro[2]), max(meu[3], outro[3])]
+
+    def salvar(self):
+        """Mescla com o arquivo (sob trava) e grava quem tem fichas gastas, falhas ou bloqueio"""
+        if not (self.arquivo and PERSISTIR and self._alterado):
+            return
+        agora = time.time()
+        with trava_arquivo(self.arquivo):
+            estados = self._ler_disco()
+            for usuario, estado in self.usuarios.items():
+                if usuario in estados:
+                    mesclado = self._mesclar(estado, estados[usuario])
+                    if usuario in self._zerados:
+                        mesclado[2:] = estado[2:]
+                    estado[:] = mesclado
+                estados[usuario] = estado
+            # Descarta o que expirou ou já se recuperou por completo
+            validos = [(u, e) for u, e in estados.items()
+                       if (e[1] > agora - TTL_ESTADO or e[3] > agora)
+                       and (e[2] or e[3] > agora or e[0] + (agora - e[1]) * RECARGA_USUARIO < CAPACIDADE_USUARIO)]
+            validos.sort(key=lambda item: item[1][1])
+            _gravar_json_atomico(self.arquivo, dict(validos[-MAX_ESTADOS:]))
+        self._disco, self._mtime_disco = {}, None
+        self._zerados.clear()
+        self._alterado = False
+
+
+limitador_login = LimitadorLogin(ARQUIVO_LIMITADOR if PERSISTIR else None)
+atexit.register(limitador_login.salvar)
@@ -1,7 +1,11 @@
 import os
 import getpass
-from datetime import datetime
-from usuarios.usuarios import usuario_logado, eh_admin, registrar_log, usuarios_cadastrados, salvar_usuarios
+from datetime import datetime, timedelta
+from typing import Optional
+from security.detector import detector_acessos
+from security.senhas import gerar_hash, verificar_senha
+from logs.logs import eventos_desde, eventos_do_usuario, formatar_evento
+from usuarios.usuarios import get_usuario_logado, eh_admin, registrar_log, usuarios_cadastrados, salvar_usuarios
 
 # ========== CONFIGURAÇÕES ==========
 COR_SUCESSO = "\033[1;32m"
@@ -9,16 +13,17 @@ COR_ERRO = "\033[1;31m"
 COR_TITULO = "\033[1;36m"
 COR_ALERTA = "\033[1;33m"
 RESET_COR = "\033[0m"
+ACOES_ACESSO = ("Login realizado", "Login falhou", "Acesso suspeito", "Logout")
 
 # ========== FUNÇÕES PRINCIPAIS ==========
-def tela_seguranca():
+def tela_seguranca(sessao: Optional[str] = None):
     """Menu completo de segurança"""
     while True:
         print(f"\n{COR_TITULO}=== SEGURANÇA E PRIVACIDADE ===")
         print("1. 🔒 Políticas de Segurança")
         print("2. 🔑 Alterar minha senha")
         
-        if eh_admin():
+        if eh_admin(sessao):
             print(f"{COR_ALERTA}3. ⚠️ Relatório de Acessos Suspeitos{RESET_COR}")
             print(f"{COR_ALERTA}4. 🛡️ Forçar Troca de Senha (ADM){RESET_COR}")
         
@@ -30,11 +35,11 @@ def tela_seguranca():
         if opcao == '1':
             mostrar_politicas()
         elif opcao == '2':
-            alterar_senha()
-        elif opcao == '3' and eh_admin():
+            alterar_senha(sessao)
+        elif opcao == '3' and eh_admin(sessao):
             relatorio_acessos()
-        elif opcao == '4' and eh_admin():
-            forcar_troca_senha()
+        elif opcao == '4' and eh_admin(sessao):
+            forcar_troca_senha(sessao)
         elif opcao == '0':
             break
         else:
@@ -53,8 +58,9 @@ def mostrar_politicas():
     print(f"• Auditoria periódica dos sistemas{RESET_COR}")
     input("\nPressione Enter para voltar...")
 
-def alterar_senha():
+def alterar_senha(sessao: Optional[str] = None):
     """Permite ao usuário alterar sua própria senha"""
+    usuario_logado = get_usuario_logado(sessao)
     if not usuario_logado:
         print(f"{COR_ERRO}⚠️ Faça login primeiro!{RESET_COR}")
         return
@@ -63,7 +69,7 @@ def alterar_senha():
     
     # Verifica senha atual
     senha_atual = getpass.getpass("Senha atual: ")
-    if usuarios_cadastrados[usuario_logado['nome']]['senha'] != senha_atual:
+    if not verificar_senha(senha_atual, usuarios_cadastrados[usuario_logado['nome']]['senha']):
         print(f"{COR_ERRO}❌ Senha atual incorreta!{RESET_COR}")
         return
 
@@ -76,9 +82,9 @@ def alterar_senha():
         return
 
     # Atualiza no sistema
-    usuarios_cadastrados[usuario_logado['nome']]['senha'] = nova_senha
-    salvar_usuarios()
-    registrar_log("Senha alterada", f"Usuário: {usuario_logado['nome']}")
+    usuarios_cadastrados[usuario_logado['nome']]['senha'] = gerar_hash(nova_senha)
+    salvar_usuarios(usuario_logado['nome'])
+    registrar_log("Senha alterada", f"Usuário: {usuario_logado['nome']}", alvo=usuario_logado['nome'], sessao=sessao)
     print(f"\n{COR_SUCESSO}✅ Senha atualizada com sucesso!{RESET_COR}")
     input("Pressione Enter para voltar...")
 
@@ -88,25 +94,65 @@ def relatorio_acessos():
     print(f"\n{COR_ALERTA}=== ACESSOS SUSPEITOS ===")
     print("1. 📅 Últimos 30 dias")
     print("2. 🔍 Buscar por usuário")
+    print("3. 🚨 Alertas em tempo real")
     print("0. ↩ Voltar")
     
     opcao = input("Escolha: ").strip()
-    # Implemente a lógica de relatórios aqui
-    print(f"{COR_SUCESSO}Relatório gerado com sucesso!{RESET_COR}")
+    if opcao == '3':
+        mostrar_alertas()
+        return
+    if opcao == '1':
+        desde = datetime.now() - timedelta(days=30)
+        eventos = (e for e in eventos_desde(desde) if e["acao"] in ACOES_ACESSO)
+    elif opcao == '2':
+        usuario = input("Usuário: ").strip()
+        eventos = eventos_do_usuario(usuario)
+    elif opcao == '0':
+        return
+    else:
+        print(f"{COR_ERRO}❌ Opção inválida!{RESET_COR}")
+        return
+
+    # Imprime conforme lê: relatórios grandes não ficam inteiros em memória
+    total = 0
+    for evento in eventos:
+        print(formatar_evento(evento))
+        total += 1
+    print(f"{COR_SUCESSO}Relatório gerado com sucesso! ({total} eventos){RESET_COR}")
     input("Pressione Enter para voltar...")
 
-def forcar_troca_senha():
+def mostrar_alertas():
+    """Mostra o estado do detector de acessos (sem reler o log)"""
+    print(f"\n{COR_ALERTA}=== ALERTAS EM TEMPO REAL ===")
+    print(f"Tentativas analisadas: {detector_acessos.tentativas} | Falhas: {detector_acessos.falhas}")
+
+    maiores = detector_acessos.maiores_falhas()
+    if maiores:
+        print("\nMais falhas no último minuto:")
+        for usuario, total in maiores:
+            print(f"  • {usuario}: {total}")
+
+    if not detector_acessos.alertas:
+        print(f"\n{COR_SUCESSO}Nenhum alerta registrado{RESET_COR}")
+    for alerta in reversed(detector_acessos.alertas):
+        print(f"{COR_ERRO}[{alerta['ts']}] {alerta['tipo']} — {alerta['chave']}: {alerta['detalhes']}{COR_ALERTA}")
+    print("="*40 + RESET_COR)
+    input("Pressione Enter para voltar...")
+
+def forcar_troca_senha(sessao: Optional[str] = None):
     """Força um usuário a trocar a senha no próximo login (apenas ADM)"""
+    if not eh_admin(sessao):
+        print(f"{COR_ERRO}⚠️ Acesso restrito!{RESET_COR}")
+        return
     print(f"\n{COR_ALERTA}=== FORÇAR TROCA DE SENHA ===")
-    from usuarios.usuarios import listar_usuarios
-    listar_usuarios()
+    from usuarios.usuarios import escolher_usuario
     
-    usuario = input("\nNome do usuário: ").strip()
-    if usuario in usuarios_cadastrados:
+    usuario = escolher_usuario("Usuário")
+    if usuario is not None:
         usuarios_cadastrados[usuario]['precisa_trocar_senha'] = True
-        salvar_usuarios()
-        registrar_log("Forçou troca de senha", f"ADM: {usuario_logado['nome']} | Usuário: {usuario}")
+        salvar_usuarios(usuario)
+        registrar_log("Forçou troca de senha", f"ADM: {get_usuario_logado(sessao)['nome']} | Usuário: {usuario}", alvo=usuario, sessao=sessao)
         print(f"\n{COR_SUCESSO}✅ Usuário precisará trocar a senha no próximo login!{RESET_COR}")
     else:
-        print(f"{COR_ERRO}❌ Usuário não encontrado!{RESET_COR}")
+        print(f"{COR_ALERTA}❌ Operação cancelada.{RESET_COR}")
     input("Pressione Enter para voltar...")
\ No newline at end of file
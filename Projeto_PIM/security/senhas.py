@@ -0,0 +1,175 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+
+# ========== CONFIGURAÇÕES ==========
+ARQUIVO_PARAMETROS = "parametros_senha.json"  # Gerado por: python -m security.senhas calibrar
+PARAMETROS_PADRAO = {"algoritmo": "scrypt", "n": 2 ** 14, "r": 8, "p": 1}
+PARAMETROS_PBKDF2 = {"algoritmo": "pbkdf2_sha256", "iteracoes": 600_000}
+TAMANHO_SAL = 16
+TAMANHO_HASH = 32
+ALVO_CALIBRACAO_MS = 250  # Tempo que uma verificação pode levar no nosso hardware
+COR_SUCESSO = "\033[1;32m"
+COR_ERRO = "\033[1;31m"
+RESET_COR = "\033[0m"
+
+
+def _b64(dados: bytes) -> str:
+    return base64.b64encode(dados).decode('ascii')
+
+def carregar_parametros() -> Dict:
+    """Parâmetros calibrados (ou o padrão); sem scrypt no OpenSSL, cai para PBKDF2"""
+    parametros = PARAMETROS_PADRAO
+    try:
+        with open(ARQUIVO_PARAMETROS, 'r', encoding='utf-8') as f:
+            parametros = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass
+    if parametros["algoritmo"] == "scrypt" and not hasattr(hashlib, "scrypt"):
+        return PARAMETROS_PBKDF2
+    return parametros
+
+PARAMETROS_ATUAIS = carregar_parametros()
+
+
+# ========== HASH E VERIFICAÇÃO ==========
+def _derivar(senha: str, sal: bytes, parametros: Dict) -> bytes:
+    if parametros["algoritmo"] == "scrypt":
+        n, r, p = parametros["n"], parametros["r"], parametros["p"]
+        return hashlib.scrypt(senha.encode('utf-8'), salt=sal, n=n, r=r, p=p,
+                              maxmem=256 * n * r + 2 ** 20, dklen=TAMANHO_HASH)
+    return hashlib.pbkdf2_hmac("sha256", senha.encode('utf-8'), sal,
+                               parametros["iteracoes"], dklen=TAMANHO_HASH)
+
+def _descrever(parametros: Dict) -> str:
+    """Parâmetros no formato gravado junto do hash (ex.: 'scrypt$n=16384,r=8,p=1')"""
+    if parametros["algoritmo"] == "scrypt":
+        return f"scrypt$n={parametros['n']},r={parametros['r']},p={parametros['p']}"
+    return f"pbkdf2_sha256$i={parametros['iteracoes']}"
+
+def _interpretar(armazenada: str) -> Optional[tuple]:
+    """'algoritmo$parametros$sal$hash' -> (parâmetros, sal, hash); None se for texto puro.
+
+    Texto puro que só se parece com um hash (ex.: 'scrypt$x$y$z') também é None.
+    """
+    partes = armazenada.split("$")
+    if len(partes) != 4 or partes[0] not in ("scrypt", "pbkdf2_sha256"):
+        return None
+    try:
+        valores = dict(item.split("=") for item in partes[1].split(","))
+        if partes[0] == "scrypt":
+            parametros = {"algoritmo": "scrypt", "n": int(valores["n"]), "r": int(valores["r"]), "p": int(valores["p"])}
+            if parametros["n"] < 2 or parametros["n"] & (parametros["n"] - 1):
+                return None  # scrypt exige n potência de 2
+        else:
+            parametros = {"algoritmo": "pbkdf2_sha256", "iteracoes": int(valores["i"])}
+        sal = base64.b64decode(partes[2], validate=True)
+        esperado = base64.b64decode(partes[3], validate=True)
+    except (ValueError, KeyError, binascii.Error):
+        return None
+    return parametros, sal, esperado
+
+def gerar_hash(senha: str, parametros: Optional[Dict] = None) -> str:
+    """Hash com sal aleatório no formato 'algoritmo$parametros$sal$hash'"""
+    parametros = parametros or PARAMETROS_ATUAIS
+    sal = os.urandom(TAMANHO_SAL)
+    return f"{_descrever(parametros)}${_b64(sal)}${_b64(_derivar(senha, sal, parametros))}"
+
+def verificar_senha(senha: str, armazenada: str) -> bool:
+    """Confere a senha com o hash gravado (aceita senhas antigas em texto puro)"""
+    dados = _interpretar(armazenada)
+    if dados is None:
+        return hmac.compare_digest(senha.encode('utf-8'), armazenada.encode('utf-8'))
+    parametros, sal, esperado = dados
+    return hmac.compare_digest(_derivar(senha, sal, parametros), esperado)
+
+def hash_ficticio() -> str:
+    """Hash de uma senha aleatória com os parâmetros atuais, gerado uma vez.
+
+    Verificar contra ele quando o usuário não existe custa o mesmo que um usuário
+    real: o tempo de resposta não revela quais nomes estão cadastrados.
+    """
+    global _hash_ficticio
+    if _hash_ficticio is None:
+        _hash_ficticio = gerar_hash(_b64(os.urandom(TAMANHO_SAL)))
+    return _hash_ficticio
+
+_hash_ficticio: Optional[str] = None
+
+def eh_hash(armazenada: str) -> bool:
+    """True se o valor já está no formato de hash (e não em texto puro)"""
+    return _interpretar(armazenada) is not None
+
+def precisa_rehash(armazenada: str) -> bool:
+    """True para senhas em texto puro ou com parâmetros diferentes dos atuais"""
+    return not armazenada.startswith(_descrever(PARAMETROS_ATUAIS) + "$")
+
+
+# ========== CALIBRAÇÃO ==========
+def calibrar(alvo_ms: float = ALVO_CALIBRACAO_MS) -> Dict:
+    """Escolhe o maior custo cuja verificação cabe no tempo alvo e grava em ARQUIVO_PARAMETROS"""
+    if hasattr(hashlib, "scrypt"):
+        candidatos = [{"algoritmo": "scrypt", "n": 2 ** k, "r": 8, "p": 1} for k in range(12, 21)]
+    else:
+        candidatos = [{"algoritmo": "pbkdf2_sha256", "iteracoes": 100_000 * k} for k in range(1, 31)]
+
+    escolhido = candidatos[0]
+    for parametros in candidatos:
+        inicio = time.perf_counter()
+        _derivar("calibracao", os.urandom(TAMANHO_SAL), parametros)
+        duracao_ms = (time.perf_counter() - inicio) * 1000
+        print(f"  {_descrever(parametros)}: {duracao_ms:.0f} ms")
+        if duracao_ms > alvo_ms:
+            break
+        escolhido = parametros
+
+    with open(ARQUIVO_PARAMETROS, 'w', encoding='utf-8') as f:
+        json.dump(escolhido, f)
+    print(f"{COR_SUCESSO}✅ Parâmetros escolhidos: {_descrever(escolhido)}{RESET_COR}")
+    return escolhido
+
+
+# ========== MIGRAÇÃO EM MASSA ==========
+def _hash_para_migracao(item: tuple) -> tuple:
+    nome, senha = item
+    return nome, gerar_hash(senha)
+
+def migrar_senhas(processos: Optional[int] = None) -> int:
+    """Gera o hash de todas as senhas em texto puro num pool de processos e grava tudo de uma vez"""
+    from usuarios.usuarios import usuarios_cadastrados, salvar_usuarios, registrar_log
+
+    pendentes = [(nome, dados["senha"]) for nome, dados in usuarios_cadastrados.items()
+                 if _interpretar(dados.get("senha", "")) is None]
+    if not pendentes:
+        print(f"{COR_SUCESSO}✅ Nenhuma senha em texto puro{RESET_COR}")
+        return 0
+
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        for nome, senha_hash in pool.map(_hash_para_migracao, pendentes, chunksize=64):
+            usuarios_cadastrados[nome]["senha"] = senha_hash
+    salvar_usuarios(*(nome for nome, _ in pendentes))  # Uma gravação, só com os migrados
+    registrar_log("Senhas migradas para hash", f"Total: {len(pendentes)}")
+
+    print(f"{COR_SUCESSO}✅ {len(pendentes)} senhas migradas em "
+          f"{time.perf_counter() - inicio:.1f}s{RESET_COR}")
+    return len(pendentes)
+
+
+if __name__ == "__main__":
+    # Uso: python -m security.senhas calibrar [ms] | migrar [processos]
+    comando = sys.argv[1] if len(sys.argv) > 1 else ""
+    if comando == "calibrar":
+        calibrar(float(sys.argv[2]) if len(sys.argv) > 2 else ALVO_CALIBRACAO_MS)
+    elif comando == "migrar":
+        migrar_senhas(int(sys.argv[2]) if len(sys.argv) > 2 else None)
+    else:
+        print(f"{COR_ERRO}Uso: python -m security.senhas calibrar [ms] | migrar [processos]{RESET_COR}")
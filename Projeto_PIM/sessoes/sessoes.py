@@ -0,0 +1,75 @@
+import secrets
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+# ========== CONFIGURAÇÕES ==========
+TTL_INATIVIDADE = 30 * 60       # Segundos sem uso até a sessão expirar
+TTL_ABSOLUTO = 8 * 60 * 60      # Duração máxima de uma sessão, mesmo em uso
+MAX_SESSOES = 10_000            # Acima disso, a sessão usada há mais tempo é encerrada
+
+
+class GerenciadorSessoes:
+    """Sessões com token opaco: busca O(1), expiração por inatividade/idade e limite LRU"""
+
+    def __init__(self, ttl_inatividade: float = TTL_INATIVIDADE,
+                 ttl_absoluto: float = TTL_ABSOLUTO, max_sessoes: int = MAX_SESSOES):
+        self.ttl_inatividade = ttl_inatividade
+        self.ttl_absoluto = ttl_absoluto
+        self.max_sessoes = max_sessoes
+        self._sessoes = OrderedDict()   # token -> sessão, do uso mais antigo ao mais recente
+        self._por_usuario = {}          # nome -> tokens abertos
+
+    def criar(self, nome: str, is_admin: bool, origem: str = "") -> Dict:
+        """Abre uma sessão e devolve o dict (com 'token', 'nome' e 'is_admin')"""
+        agora = time.time()
+        sessao = {
+            "token": secrets.token_urlsafe(32),
+            "nome": nome,
+            "is_admin": is_admin,
+            "origem": origem,
+            "criada_em": agora,
+            "ultimo_uso": agora
+        }
+        self._sessoes[sessao["token"]] = sessao
+        self._por_usuario.setdefault(nome, set()).add(sessao["token"])
+        while len(self._sessoes) > self.max_sessoes:
+            self.encerrar(next(iter(self._sessoes)))
+        return sessao
+
+    def obter(self, token: Optional[str]) -> Optional[Dict]:
+        """Sessão válida do token (renovando o uso) ou None se não existe/expirou"""
+        sessao = self._sessoes.get(token) if token else None
+        if sessao is None:
+            return None
+        agora = time.time()
+        if (agora - sessao["ultimo_uso"] > self.ttl_inatividade
+                or agora - sessao["criada_em"] > self.ttl_absoluto):
+            self.encerrar(token)
+            return None
+        sessao["ultimo_uso"] = agora
+        self._sessoes.move_to_end(token)
+        return sessao
+
+    def encerrar(self, token: str) -> Optional[Dict]:
+        sessao = self._sessoes.pop(token, None)
+        if sessao is not None:
+            tokens = self._por_usuario.get(sessao["nome"], set())
+            tokens.discard(token)
+            if not tokens:
+                self._por_usuario.pop(sessao["nome"], None)
+        return sessao
+
+    def encerrar_do_usuario(self, nome: str) -> int:
+        """Encerra todas as sessões de um usuário (ex.: conta removida)"""
+        tokens = list(self._por_usuario.get(nome, ()))
+        for token in tokens:
+            self.encerrar(token)
+        return len(tokens)
+
+    def __len__(self) -> int:
+        return len(self._sessoes)
+
+
+gerenciador_sessoes = GerenciadorSessoes()
@@ -0,0 +1,173 @@
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+from security.senhas import gerar_hash, eh_hash
+from usuarios.indices import normalizar_email
+from usuarios.validacoes import validar_email, validar_idade, validar_senha, validar_nome_usuario
+
+
+# ========== CONFIGURAÇÕES ==========
+TAMANHO_BLOCO_IMPORTACAO = 5000  # Linhas lidas e validadas por vez (limita a memória)
+MAX_ERROS_EXIBIDOS = 20          # O relatório completo vai para <arquivo>.erros.csv
+COR_SUCESSO = "\033[1;32m"
+COR_ERRO = "\033[1;33m"
+COR_TITULO = "\033[1;36m"
+RESET_COR = "\033[0m"
+
+
+# ========== LEITURA EM FLUXO ==========
+def ler_registros(arquivo: str) -> Iterator[Tuple[int, Dict]]:
+    """Gera (número da linha, registro) de um CSV com cabeçalho ou de um JSONL"""
+    with open(arquivo, 'r', encoding='utf-8-sig', newline='') as f:
+        if arquivo.lower().endswith(".csv"):
+            # Linha 1 é o cabeçalho
+            for numero, registro in enumerate(csv.DictReader(f), 2):
+                yield numero, registro
+            return
+        for numero, linha in enumerate(f, 1):
+            if not linha.strip():
+                continue
+            try:
+                yield numero, json.loads(linha)
+            except json.JSONDecodeError:
+                yield numero, None
+
+def _perfil_admin(valor) -> bool:
+    return str(valor or "").strip().lower() in ("1", "true", "sim", "s", "admin")
+
+
+# ========== VALIDAÇÃO (PROCESSOS DE TRABALHO) ==========
+def _validar_registro(item: Tuple[int, Dict]) -> Tuple[int, str, Optional[Dict], List[str]]:
+    """Valida uma linha e já gera o hash da senha: roda dentro do pool de processos"""
+    numero, registro = item
+    nome = str(registro.get("nome", "")).strip()
+    email = str(registro.get("email", "")).strip()
+    idade = str(registro.get("idade", "")).strip()
+    senha = str(registro.get("senha", ""))
+
+    erros = [erro for erro in (validar_nome_usuario(nome), validar_email(email), validar_idade(idade))
+             if erro]
+    senha_ja_em_hash = eh_hash(senha)  # Exportações de outra instalação trazem o hash pronto
+    if not senha_ja_em_hash and (erro := validar_senha(senha)):
+        erros.append(erro)
+    if erros:
+        return numero, nome, None, erros
+
+    dados = {
+        "senha": senha if senha_ja_em_hash else gerar_hash(senha),
+        "email": email,
+        "idade": int(idade),
+        "is_admin": _perfil_admin(registro.get("is_admin")),
+        "data_cadastro": datetime.now().isoformat(),
+        "cursos": [],
+        "certificados": [],
+        "modulos_concluidos": {},
+        "ultimo_acesso": None
+    }
+    return numero, nome, dados, []
+
+
+# ========== IMPORTAÇÃO ==========
+def importar_usuarios(arquivo: str, sessao: Optional[str] = None,
+                      processos: Optional[int] = None) -> Tuple[int, List[Tuple[int, str]]]:
+    """Importa usuários de um CSV/JSONL validando em paralelo e grava tudo de uma vez.
+
+    Retorna (quantidade aceita, [(linha, erro), ...]).
+    """
+    from usuarios.usuarios import recarregar_usuarios, salvar_usuarios, registrar_log, get_indices
+
+    usuarios = recarregar_usuarios()
+    emails_existentes = get_indices().por_email
+    nomes_vistos, emails_vistos = set(), set()
+    aceitos: Dict[str, Dict] = {}
+    erros: List[Tuple[int, str]] = []
+
+    inicio = time.perf_counter()
+    registros = ler_registros(arquivo)
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        while bloco := list(islice(registros, TAMANHO_BLOCO_IMPORTACAO)):
+            # Duplicatas são checadas aqui, na ordem do arquivo: a primeira ocorrência vence
+            candidatos = []
+            for numero, registro in bloco:
+                if not isinstance(registro, dict):
+                    erros.append((numero, "Linha mal formada"))
+                    continue
+                nome = str(registro.get("nome", "")).strip()
+                email = normalizar_email(registro.get("email"))
+                if nome in usuarios or nome in nomes_vistos:
+                    erros.append((numero, f"Usuário já existe: {nome}"))
+                    continue
+                if email in emails_existentes or email in emails_vistos:
+                    erros.append((numero, f"Email já cadastrado: {email}"))
+                    continue
+                nomes_vistos.add(nome)
+                emails_vistos.add(email)
+                candidatos.append((numero, registro))
+
+            for numero, nome, dados, problemas in pool.map(_validar_registro, candidatos, chunksize=64):
+                if problemas:
+                    erros.append((numero, "; ".join(problemas)))
+                else:
+                    aceitos[nome] = dados
+
+    if aceitos:
+        usuarios.update(aceitos)
+        salvar_usuarios(*aceitos)  # Uma única gravação com todos os aceitos
+    erros.sort()
+    registrar_log("Importação de usuários",
+                  f"Arquivo: {os.path.basename(arquivo)} | Aceitos: {len(aceitos)} | Rejeitados: {len(erros)}",
+                  sessao=sessao)
+    print(f"{COR_SUCESSO}✅ {len(aceitos)} usuários importados em "
+          f"{time.perf_counter() - inicio:.1f}s{RESET_COR}")
+    return len(aceitos), erros
+
+def gravar_relatorio_erros(arquivo: str, erros: List[Tuple[int, str]]) -> str:
+    """Grava todas as linhas rejeitadas em <arquivo>.erros.csv"""
+    caminho = f"{arquivo}.erros.csv"
+    with open(caminho, 'w', encoding='utf-8', newline='') as f:
+        escritor = csv.writer(f)
+        escritor.writerow(["linha", "erro"])
+        escritor.writerows(erros)
+    return caminho
+
+def exibir_erros(arquivo: str, erros: List[Tuple[int, str]]):
+    if not erros:
+        return
+    print(f"{COR_ERRO}⚠️ {len(erros)} linhas rejeitadas:")
+    for numero, erro in erros[:MAX_ERROS_EXIBIDOS]:
+        print(f"  Linha {numero}: {erro}")
+    if len(erros) > MAX_ERROS_EXIBIDOS:
+        print(f"  ... e mais {len(erros) - MAX_ERROS_EXIBIDOS}")
+    print(f"Relatório completo: {gravar_relatorio_erros(arquivo, erros)}{RESET_COR}")
+
+def tela_importacao(sessao: Optional[str] = None):
+    """Importação em massa pelo menu administrativo"""
+    from usuarios.usuarios import eh_admin
+    if not eh_admin(sessao):
+        print(f"{COR_ERRO}⚠️ Acesso restrito!{RESET_COR}")
+        return
+
+    print(f"\n{COR_TITULO}=== IMPORTAR USUÁRIOS ===")
+    print("Formatos: .csv (cabeçalho nome,email,idade,senha[,is_admin]) ou .jsonl")
+    arquivo = input("Arquivo: ").strip()
+    if not os.path.isfile(arquivo):
+        print(f"{COR_ERRO}❌ Arquivo não encontrado!{RESET_COR}")
+        return
+    _, erros = importar_usuarios(arquivo, sessao)
+    exibir_erros(arquivo, erros)
+    print("="*40 + RESET_COR)
+
+
+if __name__ == "__main__":
+    # Uso: python -m usuarios.importacao <arquivo.csv|arquivo.jsonl> [processos]
+    if len(sys.argv) < 2:
+        print(f"{COR_ERRO}Uso: python -m usuarios.importacao <arquivo.csv|arquivo.jsonl> [processos]{RESET_COR}")
+        sys.exit(1)
+    _, erros_cli = importar_usuarios(sys.argv[1], processos=int(sys.argv[2]) if len(sys.argv) > 2 else None)
+    exibir_erros(sys.argv[1], erros_cli)
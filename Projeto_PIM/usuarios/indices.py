@@ -0,0 +1,212 @@
+import sys
+from bisect import bisect_left, insort
+from collections.abc import Mapping
+from typing import Dict, List, Optional, Set, Tuple
+
+from cursos.estrutura import mascara_modulos
+
+
+# ========== ÍNDICES SECUNDÁRIOS ==========
+def normalizar_email(email) -> str:
+    return str(email or "").strip().lower()
+
+def _remover_ordenado(lista: List[tuple], chave: tuple):
+    i = bisect_left(lista, chave)
+    if i < len(lista) and lista[i] == chave:
+        del lista[i]
+
+class IndicesUsuarios:
+    """Índices por email (único), perfil, curso e progresso, mantidos junto com os usuários.
+
+    Guarda os campos indexados de cada usuário para, ao sincronizar um nome,
+    remover só as entradas antigas sem varrer os demais.
+    """
+
+    def __init__(self):
+        self.por_email: Dict[str, str] = {}                    # email -> nome
+        self.por_perfil: Dict[bool, Set[str]] = {True: set(), False: set()}
+        self.por_curso: Dict[str, Set[str]] = {}               # id_curso -> alunos
+        self._campos: Dict[str, tuple] = {}                    # nome -> (email, is_admin, cursos, cadastro)
+        self.emails_duplicados: Dict[str, Set[str]] = {}       # Conflitos vindos de dados antigos
+        self.nomes_ordenados: List[Tuple[str, str]] = []       # (nome minúsculo, nome) para buscas
+        self.cadastros_ordenados: List[Tuple[str, str]] = []   # (data_cadastro, nome) para listagens
+        self.progresso: Dict[str, Dict[str, int]] = {}         # nome -> {id_curso: bitset de módulos}
+
+    def reconstruir(self, usuarios: Mapping):
+        self.__init__()
+        for nome, dados in usuarios.items():
+            self._adicionar(nome, dados)
+        self.nomes_ordenados = sorted((nome.lower(), nome) for nome in self._campos)
+        self.cadastros_ordenados = sorted((campos[3], nome) for nome, campos in self._campos.items())
+
+    def sincronizar(self, nome: str, dados: Optional[Dict]):
+        """Atualiza as entradas de um usuário (dados=None quando foi removido)"""
+        existia = nome in self._campos
+        if existia:
+            _remover_ordenado(self.cadastros_ordenados, (self._campos[nome][3], nome))
+            self._remover(nome)
+        if dados is not None:
+            self._adicionar(nome, dados)
+            insort(self.cadastros_ordenados, (self._campos[nome][3], nome))
+        if existia and dados is None:
+            _remover_ordenado(self.nomes_ordenados, (nome.lower(), nome))
+        elif not existia and dados is not None:
+            insort(self.nomes_ordenados, (nome.lower(), nome))
+
+    def _adicionar(self, nome: str, dados: Dict):
+        email = normalizar_email(dados.get("email"))
+        is_admin = bool(dados.get("is_admin"))
+        cursos = frozenset(dados.get("cursos", ()))
+        self._campos[nome] = (email, is_admin, cursos, dados.get("data_cadastro") or "")
+
+        if email:
+            dono = self.por_email.setdefault(email, nome)
+            if dono != nome:
+                self.emails_duplicados.setdefault(email, {dono}).add(nome)
+        self.por_perfil[is_admin].add(nome)
+        for id_curso in cursos:
+            self.por_curso.setdefault(id_curso, set()).add(nome)
+        concluidos = dados.get("modulos_concluidos") or {}
+        mascaras = {id_curso: mascara_modulos(ids) for id_curso, ids in concluidos.items() if ids}
+        if mascaras:
+            self.progresso[nome] = mascaras
+
+    def _remover(self, nome: str):
+        email, is_admin, cursos, _ = self._campos.pop(nome)
+        if email in self.emails_duplicados:
+            donos = self.emails_duplicados[email]
+            donos.discard(nome)
+            if self.por_email.get(email) == nome:
+                self.por_email[email] = next(iter(donos))
+            if len(donos) < 2:
+                del self.emails_duplicados[email]
+        elif self.por_email.get(email) == nome:
+            del self.por_email[email]
+        self.por_perfil[is_admin].discard(nome)
+        self.progresso.pop(nome, None)
+        for id_curso in cursos:
+            alunos = self.por_curso.get(id_curso)
+            if alunos is not None:
+                alunos.discard(nome)
+                if not alunos:
+                    del self.por_curso[id_curso]
+
+    # ----- Consultas -----
+    def buscar_por_email(self, email: str) -> Optional[str]:
+        return self.por_email.get(normalizar_email(email))
+
+    def listar_por_perfil(self, is_admin: bool) -> Set[str]:
+        return self.por_perfil[bool(is_admin)]
+
+    def alunos_matriculados(self, id_curso: str) -> Set[str]:
+        return self.por_curso.get(id_curso, set())
+
+    def data_cadastro(self, nome: str) -> str:
+        campos = self._campos.get(nome)
+        return campos[3] if campos else ""
+
+    def modulos_concluidos(self, nome: str, id_curso: str) -> int:
+        """Bitset dos módulos que o aluno concluiu no curso (0 se nenhum)"""
+        return self.progresso.get(nome, {}).get(id_curso, 0)
+
+    def buscar_por_prefixo(self, prefixo: str, limite: int) -> List[str]:
+        """Até 'limite' nomes que começam com o prefixo (sem diferenciar maiúsculas)"""
+        prefixo = prefixo.lower()
+        nomes = self.nomes_ordenados
+        encontrados = []
+        i = bisect_left(nomes, (prefixo,))
+        while i < len(nomes) and len(encontrados) < limite and nomes[i][0].startswith(prefixo):
+            encontrados.append(nomes[i][1])
+            i += 1
+        return encontrados
+
+    def buscar_aproximado(self, termo: str, distancia_max: int, limite: int) -> List[Tuple[int, str]]:
+        """Nomes a no máximo 'distancia_max' edições do termo, do mais próximo ao mais distante.
+
+        Percorre a lista ordenada como uma trie: nomes vizinhos compartilham prefixo, então
+        as linhas da distância de edição do prefixo comum são reaproveitadas, e todos os
+        nomes de um prefixo são pulados quando a linha já passa do limite.
+        """
+        termo = termo.lower()
+        nomes = self.nomes_ordenados
+        linhas = [list(range(len(termo) + 1))]  # linhas[d]: distâncias para o prefixo de tamanho d
+        anterior = ""
+        encontrados = []
+        i = 0
+        while i < len(nomes):
+            chave = nomes[i][0]
+            comum = 0
+            limite_comum = min(len(anterior), len(chave))
+            while comum < limite_comum and anterior[comum] == chave[comum]:
+                comum += 1
+            del linhas[comum + 1:]
+
+            podado = False
+            for posicao in range(comum, len(chave)):
+                letra, acima = chave[posicao], linhas[-1]
+                linha = [acima[0] + 1]
+                for j in range(1, len(termo) + 1):
+                    linha.append(min(linha[j - 1] + 1, acima[j] + 1,
+                                     acima[j - 1] + (termo[j - 1] != letra)))
+                linhas.append(linha)
+                if min(linha) > distancia_max:
+                    # Nenhum nome com este prefixo chega perto: pula o bloco inteiro
+                    i = bisect_left(nomes, (chave[:posicao + 1] + "\uffff",), i)
+                    podado = True
+                    break
+            anterior = chave[:len(linhas) - 1]
+            if podado:
+                continue
+            if linhas[-1][-1] <= distancia_max:
+                encontrados.append((linhas[-1][-1], nomes[i][1]))
+            i += 1
+        encontrados.sort()
+        return encontrados[:limite]
+
+    # ----- Verificação -----
+    def verificar(self, usuarios: Mapping) -> List[str]:
+        """Compara os índices com uma reconstrução a partir dos dados; lista as divergências"""
+        esperado = IndicesUsuarios()
+        esperado.reconstruir(usuarios)
+        problemas = []
+
+        for email, nomes in esperado.emails_duplicados.items():
+            problemas.append(f"Email repetido: {email} ({', '.join(sorted(nomes))})")
+        for email in esperado.por_email.keys() | self.por_email.keys():
+            if email not in esperado.por_email:
+                problemas.append(f"Email no índice sem usuário: {email} -> {self.por_email[email]}")
+            elif email not in self.por_email:
+                problemas.append(f"Email fora do índice: {email} ({esperado.por_email[email]})")
+            elif (self.por_email[email] != esperado.por_email[email]
+                    and email not in esperado.emails_duplicados):
+                problemas.append(f"Email aponta para o usuário errado: {email} -> {self.por_email[email]}")
+        if self.nomes_ordenados != esperado.nomes_ordenados:
+            for _, nome in sorted(set(esperado.nomes_ordenados) ^ set(self.nomes_ordenados)):
+                problemas.append(f"Nome divergente na busca por prefixo: {nome}")
+            if set(esperado.nomes_ordenados) == set(self.nomes_ordenados):
+                problemas.append("Lista de nomes fora de ordem")
+        if self.cadastros_ordenados != esperado.cadastros_ordenados:
+            for _, nome in sorted(set(esperado.cadastros_ordenados) ^ set(self.cadastros_ordenados)):
+                problemas.append(f"Data de cadastro divergente na listagem: {nome}")
+            if set(esperado.cadastros_ordenados) == set(self.cadastros_ordenados):
+                problemas.append("Lista de cadastros fora de ordem")
+        for is_admin, nome_perfil in ((True, "ADMIN"), (False, "ALUNO")):
+            for nome in esperado.por_perfil[is_admin] ^ self.por_perfil[is_admin]:
+                problemas.append(f"Perfil {nome_perfil} divergente: {nome}")
+        for id_curso in esperado.por_curso.keys() | self.por_curso.keys():
+            diferenca = esperado.alunos_matriculados(id_curso) ^ self.alunos_matriculados(id_curso)
+            for nome in sorted(diferenca):
+                problemas.append(f"Matrícula divergente: curso {id_curso} / {nome}")
+        for nome in esperado.progresso.keys() | self.progresso.keys():
+            if esperado.progresso.get(nome) != self.progresso.get(nome):
+                problemas.append(f"Progresso divergente: {nome}")
+        return problemas
+
+
+if __name__ == "__main__":
+    # Uso: python -m usuarios.indices verificar
+    if sys.argv[1:] != ["verificar"]:
+        print("Uso: python -m usuarios.indices verificar")
+        sys.exit(1)
+    from usuarios.usuarios import verificar_indices
+    sys.exit(1 if verificar_indices() else 0)
@@ -0,0 +1,115 @@
+from typing import Dict, List, Optional
+
+
+# ========== CONFIGURAÇÕES ==========
+NOMES_NA_PREVIA = 10  # Nomes mostrados antes da confirmação (e citados no log)
+COR_ADM = "\033[1;31m"
+COR_ERRO = "\033[1;33m"
+COR_SUCESSO = "\033[1;32m"
+RESET_COR = "\033[0m"
+
+OPERACOES = {
+    "forcar_troca": "Forçar troca de senha",
+    "deletar": "Deletar usuários",
+    "desmatricular": "Desmatricular de um curso",
+}
+
+
+# ========== SELEÇÃO ==========
+def selecionar_usuarios(**filtros) -> List[str]:
+    """Nomes que atendem aos filtros de consultar_usuarios (perfil, curso, cadastro, inatividade...)"""
+    from usuarios.usuarios import recarregar_usuarios, consultar_usuarios
+    recarregar_usuarios()
+    filtros.pop("ordenar", None)
+    return [nome for nome, _ in consultar_usuarios(**filtros)]
+
+
+# ========== APLICAÇÃO ==========
+def aplicar_operacao(operacao: str, nomes: List[str], sessao: Optional[str] = None,
+                     id_curso: Optional[str] = None) -> int:
+    """Aplica a operação a todos os nomes em memória, grava uma vez e registra um único log.
+
+    Retorna quantos usuários foram de fato alterados. O ADM da sessão nunca é removido.
+    """
+    from usuarios.usuarios import (usuarios_cadastrados, salvar_usuarios, registrar_log,
+                                   get_usuario_logado)
+    from sessoes.sessoes import gerenciador_sessoes
+
+    if operacao not in OPERACOES:
+        raise ValueError(f"Operação inválida: {operacao}")
+    if operacao == "desmatricular" and not id_curso:
+        raise ValueError("Informe o curso para desmatricular")
+    logado = get_usuario_logado(sessao)
+
+    alterados = []
+    for nome in nomes:
+        dados = usuarios_cadastrados.get(nome)
+        if dados is None:
+            continue
+        if operacao == "forcar_troca":
+            dados["precisa_trocar_senha"] = True
+        elif operacao == "deletar":
+            if logado and nome == logado["nome"]:
+                continue
+            del usuarios_cadastrados[nome]
+            gerenciador_sessoes.encerrar_do_usuario(nome)
+        else:
+            if id_curso not in dados.get("cursos", []):
+                continue
+            dados["cursos"].remove(id_curso)
+            dados.get("modulos_concluidos", {}).pop(id_curso, None)
+        alterados.append(nome)
+
+    if alterados:
+        salvar_usuarios(*alterados)  # Uma gravação para o lote inteiro
+        exemplos = ", ".join(alterados[:NOMES_NA_PREVIA])
+        if len(alterados) > NOMES_NA_PREVIA:
+            exemplos += f" (+{len(alterados) - NOMES_NA_PREVIA})"
+        curso = f" | Curso: {id_curso}" if id_curso else ""
+        registrar_log(f"Lote: {OPERACOES[operacao]}",
+                      f"Usuários: {len(alterados)}{curso} | {exemplos}", sessao=sessao)
+    return len(alterados)
+
+
+# ========== INTERFACE ==========
+def tela_operacoes_lote(sessao: Optional[str] = None):
+    """Seleciona usuários por filtros, mostra a prévia e aplica uma operação ao conjunto"""
+    from usuarios.usuarios import eh_admin, pedir_filtros_usuarios
+    if not eh_admin(sessao):
+        print(f"{COR_ERRO}⚠️ Acesso restrito!{RESET_COR}")
+        return
+
+    print(f"\n{COR_ADM}=== OPERAÇÕES EM LOTE ===")
+    print("Filtros para selecionar os usuários (em branco = sem filtro):")
+    filtros: Dict = pedir_filtros_usuarios()
+    nomes = selecionar_usuarios(**filtros)
+    if not nomes:
+        print(f"{COR_ERRO}⚠️ Nenhum usuário atende aos filtros{RESET_COR}")
+        return
+
+    print(f"\n{len(nomes)} usuários selecionados: {', '.join(nomes[:NOMES_NA_PREVIA])}"
+          f"{' ...' if len(nomes) > NOMES_NA_PREVIA else ''}")
+    opcoes = list(OPERACOES)
+    for i, operacao in enumerate(opcoes, 1):
+        print(f"{i}. {OPERACOES[operacao]}")
+    escolha = input("Operação (Enter cancela): ").strip()
+    if not (escolha.isdigit() and 1 <= int(escolha) <= len(opcoes)):
+        print(f"{COR_ERRO}❌ Cancelado{RESET_COR}")
+        return
+    operacao = opcoes[int(escolha) - 1]
+
+    id_curso = None
+    if operacao == "desmatricular":
+        id_curso = filtros.get("curso") or input("ID do curso: ").strip()
+
+    confirmacao = input(f"\nDigite {len(nomes)} para confirmar '{OPERACOES[operacao]}': ").strip()
+    if confirmacao != str(len(nomes)):
+        print(f"{COR_ERRO}❌ Cancelado{RESET_COR}")
+        return
+    try:
+        total = aplicar_operacao(operacao, nomes, sessao, id_curso)
+    except ValueError as e:
+        print(f"{COR_ERRO}❌ {e}{RESET_COR}")
+        return
+    print(f"{COR_SUCESSO}✅ {total} usuários alterados em uma única gravação{RESET_COR}")
+    print("="*40 + RESET_COR)
@@ -1,14 +1,27 @@
-import re
 import json
 import os
+from bisect import bisect_left, bisect_right
 from datetime import datetime
-from typing import Dict, Optional
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from armazenamento.armazenamento import get_repositorio, UsuariosSobDemanda
+from security.detector import detector_acessos, origem_sessao
+from security.limitador import limitador_login
+from security.senhas import gerar_hash, verificar_senha, precisa_rehash, hash_ficticio
+from sessoes.sessoes import gerenciador_sessoes
+from usuarios.indices import IndicesUsuarios
+from usuarios.validacoes import validar_email, validar_idade, validar_senha, validar_nome_usuario
+from logs.logs import ARQUIVO_LOG, registrar_evento, descarregar_logs, entradas_do_fim, acompanhar_log
 
 
 
 # ========== CONFIGURAÇÕES ==========
-ARQUIVO_JSON = "dados_usuarios.json"
-ARQUIVO_LOG = "registro_logs.log"
+TAMANHO_PAGINA_LOG = 20  # Entradas por página em visualizar_logs
+TAMANHO_PAGINA_USUARIOS = 20  # Linhas por página em listar_usuarios
+TAMANHO_PAGINA_DADOS = 5  # Registros completos por página em visualizar_dados_completos
+LIMITE_SUGESTOES = 10  # Nomes oferecidos por busca em escolher_usuario
+FATOR_ORDENAR_CANDIDATOS = 16  # Filtro por perfil/curso com menos de 1/16 dos usuários: ordena só os candidatos
+DISTANCIA_MAX_BUSCA = 2  # Erros de digitação tolerados na busca aproximada
 COR_ADM = "\033[1;31m"  # Vermelho
 COR_USUARIO = "\033[1;34m"  # Azul
 COR_ERRO = "\033[1;33m"  # Amarelo
@@ -17,31 +30,25 @@ COR_LOG = "\033[0;36m"  # Ciano
 RESET_COR = "\033[0m"
 
 
-def get_usuario_logado():
-    return usuario_logado
+def get_usuario_logado(sessao: Optional[str] = None) -> Optional[Dict]:
+    """Sessão ativa do token informado (ou da sessão deste terminal)"""
+    return gerenciador_sessoes.obter(sessao or sessao_atual)
 
 def get_usuarios_cadastrados():
     return usuarios_cadastrados
 
-def registrar_log(acao: str, detalhes: str = ""):
-    """Registra ações importantes no arquivo de log"""
-    usuario = usuario_logado['nome'] if usuario_logado else 'SISTEMA'
-    with open(ARQUIVO_LOG, 'a', encoding='utf-8') as f:
-        log_entry = (
-            f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] "
-            f"Usuário: {usuario}\n"
-            f"Ação: {acao}\n"
-            f"Detalhes: {detalhes}\n"
-            f"{'-'*50}\n"
-        )
-        f.write(log_entry)
+def registrar_log(acao: str, detalhes: str = "", alvo: Optional[str] = None, sessao: Optional[str] = None):
+    """Registra ações importantes no arquivo de log (alvo: usuário ou curso afetado)"""
+    logado = get_usuario_logado(sessao)
+    usuario = logado['nome'] if logado else 'SISTEMA'
+    registrar_evento(usuario, acao, detalhes, alvo)  # Gravado em lote por uma thread
 
 # ========== BANCO DE DADOS ==========
 def carregar_usuarios() -> Dict:
-    """Carrega usuários do JSON ou cria estrutura inicial"""
-    if os.path.exists(ARQUIVO_JSON):
-        with open(ARQUIVO_JSON, 'r') as f:
-            return json.load(f)
+    """Carrega usuários pelo repositório configurado ou cria estrutura inicial"""
+    usuarios = get_repositorio().carregar_usuarios()
+    if usuarios is not None:
+        return usuarios
     return {
         "admin": {
             "senha": "Admin@123",
@@ -53,45 +60,161 @@ def carregar_usuarios() -> Dict:
         }
     }
 
-def salvar_usuarios():
-    """Salva os dados no JSON"""
-    with open(ARQUIVO_JSON, 'w') as f:
-        json.dump(usuarios_cadastrados, f, indent=4, ensure_ascii=False)
+def recarregar_usuarios() -> Dict:
+    """Relê os usuários só se o armazenamento mudou desde a última leitura"""
+    global _assinatura_usuarios, _indices_prontos
+    assinatura = get_repositorio().assinatura_usuarios()
+    if assinatura != _assinatura_usuarios:
+        # Atualiza no mesmo dict para quem importou usuarios_cadastrados ver os dados novos
+        atualizados = carregar_usuarios()
+        if isinstance(usuarios_cadastrados, UsuariosSobDemanda):
+            usuarios_cadastrados.substituir(atualizados)
+        else:
+            usuarios_cadastrados.clear()
+            usuarios_cadastrados.update(atualizados)
+        _assinatura_usuarios = assinatura
+        _indices_prontos = False  # Reconstruídos na próxima consulta
+    return usuarios_cadastrados
+
+def salvar_usuarios(*nomes: str):
+    """Salva os usuários alterados (sem nomes, todos os da memória, mesclados com o disco)"""
+    global _assinatura_usuarios, _indices_prontos
+    if not nomes:
+        _indices_prontos = False
+    elif _indices_prontos:
+        for nome in nomes:
+            _indices.sincronizar(nome, usuarios_cadastrados.get(nome))
+    antes, depois = get_repositorio().salvar_usuarios(usuarios_cadastrados, nomes)
+    if antes == _assinatura_usuarios:
+        _assinatura_usuarios = depois
+    # Senão outro processo gravou antes de nós: o próximo recarregar_usuarios() traz tudo
+
+def get_indices() -> IndicesUsuarios:
+    """Índices secundários, montados na primeira consulta após cada carga"""
+    global _indices_prontos
+    if not _indices_prontos:
+        _indices.reconstruir(usuarios_cadastrados)
+        _indices_prontos = True
+    return _indices
+
+def buscar_por_email(email: str) -> Optional[str]:
+    return get_indices().buscar_por_email(email)
+
+def buscar_por_prefixo(prefixo: str, limite: int = LIMITE_SUGESTOES) -> List[str]:
+    return get_indices().buscar_por_prefixo(prefixo, limite)
+
+def buscar_aproximado(termo: str, limite: int = LIMITE_SUGESTOES) -> List[str]:
+    return [nome for _, nome in get_indices().buscar_aproximado(termo, DISTANCIA_MAX_BUSCA, limite)]
+
+def listar_por_perfil(is_admin: bool) -> Set[str]:
+    return get_indices().listar_por_perfil(is_admin)
+
+def alunos_matriculados(id_curso: str) -> Set[str]:
+    return get_indices().alunos_matriculados(id_curso)
+
+def verificar_indices() -> List[str]:
+    """Confere os índices contra os dados e mostra as divergências"""
+    problemas = get_indices().verificar(usuarios_cadastrados)
+    for problema in problemas:
+        print(f"{COR_ERRO}⚠️ {problema}{RESET_COR}")
+    if not problemas:
+        print(f"{COR_SUCESSO}✅ Índices consistentes ({len(usuarios_cadastrados)} usuários){RESET_COR}")
+    return problemas
+
+# ========== CONSULTAS PAGINADAS ==========
+def _ler_usuario(nome: str) -> Optional[Dict]:
+    """Registro de um usuário sem mantê-lo em memória na carga sob demanda"""
+    if isinstance(usuarios_cadastrados, UsuariosSobDemanda):
+        return usuarios_cadastrados.consultar(nome)
+    return usuarios_cadastrados.get(nome)
+
+def _passa_filtros(dados: Dict, dominio: Optional[str], desde: Optional[str], ate: Optional[str],
+                   sem_acesso_desde: Optional[str] = None) -> bool:
+    if dominio and not str(dados.get("email", "")).lower().endswith("@" + dominio.lower().lstrip("@")):
+        return False
+    cadastro = dados.get("data_cadastro") or ""
+    if desde and cadastro < desde:
+        return False
+    # Datas ISO: comparar o prefixo torna 'ate' inclusivo (2024-05-31 inclui o dia todo)
+    if ate and cadastro[:len(ate)] > ate:
+        return False
+    # Inativos: nunca acessaram ou o último acesso foi antes da data
+    if sem_acesso_desde and (dados.get("ultimo_acesso") or "") >= sem_acesso_desde:
+        return False
+    return True
+
+def cursor_usuario(nome: str, dados: Dict, ordenar: str = "nome") -> str:
+    """Cursor para continuar a listagem depois desta linha"""
+    if ordenar == "cadastro":
+        return f"{dados.get('data_cadastro') or ''}|{nome}"
+    return nome
+
+def consultar_usuarios(perfil: Optional[bool] = None, dominio: Optional[str] = None,
+                       curso: Optional[str] = None, desde: Optional[str] = None,
+                       ate: Optional[str] = None, sem_acesso_desde: Optional[str] = None,
+                       ordenar: str = "nome", cursor: Optional[str] = None) -> Iterator[Tuple[str, Dict]]:
+    """Gera (nome, dados) ordenados por nome ou data de cadastro, a partir do cursor.
+
+    Percorre as listas já ordenadas do índice a partir do cursor (bisect), sem
+    reordenar nada a cada página. Perfil e curso restringem os candidatos pelos
+    índices; os demais filtros são aplicados conforme as linhas são geradas.
+    """
+    indices = get_indices()
+    candidatos = None
+    if perfil is not None:
+        candidatos = indices.listar_por_perfil(perfil)
+    if curso:
+        alunos = indices.alunos_matriculados(curso)
+        candidatos = alunos if candidatos is None else candidatos & alunos
+
+    if ordenar == "cadastro":
+        ordenados = indices.cadastros_ordenados
+        chave = lambda nome: (indices.data_cadastro(nome), nome)
+        inicio = tuple(cursor.rpartition("|")[::2]) if cursor else None
+    else:
+        ordenados = indices.nomes_ordenados
+        chave = lambda nome: (nome.lower(), nome)
+        inicio = chave(cursor) if cursor else None
+    if candidatos is not None and len(candidatos) * FATOR_ORDENAR_CANDIDATOS < len(ordenados):
+        # Poucos candidatos: ordenar só eles sai mais barato que procurá-los na lista inteira
+        ordenados = sorted(map(chave, candidatos))
+        candidatos = None
+
+    i = bisect_right(ordenados, inicio) if inicio else 0
+    if ordenar == "cadastro" and desde:
+        i = max(i, bisect_left(ordenados, (desde,)))  # Na ordem de cadastro, 'desde' é o início da faixa
+    for i in range(i, len(ordenados)):
+        chave_atual, nome = ordenados[i]
+        if ordenar == "cadastro" and ate and chave_atual[:len(ate)] > ate:
+            return  # ... e 'ate' o fim
+        if candidatos is not None and nome not in candidatos:
+            continue
+        dados = _ler_usuario(nome)
+        if dados is not None and _passa_filtros(dados, dominio, desde, ate, sem_acesso_desde):
+            yield nome, dados
+
+def pagina_usuarios(tamanho: int = TAMANHO_PAGINA_USUARIOS, ordenar: str = "nome",
+                    cursor: Optional[str] = None, **filtros) -> Tuple[List[Tuple[str, Dict]], Optional[str]]:
+    """Uma página da listagem e o cursor da próxima (None na última)"""
+    linhas = consultar_usuarios(ordenar=ordenar, cursor=cursor, **filtros)
+    pagina = list(islice(linhas, tamanho + 1))
+    if len(pagina) <= tamanho:
+        return pagina, None
+    pagina.pop()
+    nome, dados = pagina[-1]
+    return pagina, cursor_usuario(nome, dados, ordenar)
+
+def compactar_usuarios():
+    """Consolida as alterações pendentes no armazenamento principal"""
+    get_repositorio().compactar_usuarios(usuarios_cadastrados)
 
 
 # ========== DADOS GLOBAIS ==========
+_assinatura_usuarios = get_repositorio().assinatura_usuarios()  # Lida antes: se mudar durante a carga, recarrega
 usuarios_cadastrados = carregar_usuarios()
-usuario_logado = None
-
-# ========== VALIDAÇÕES ==========
-def validar_email(email: str) -> Optional[str]:
-    if not re.match(r'^[\w\.-]+@[\w\.-]+\.\w+$', email):
-        return "Email inválido! Formato: usuario@dominio.com"
-    return None
-
-def validar_idade(idade: str) -> Optional[str]:
-    try:
-        if not 5 <= int(idade) <= 120:
-            return "Idade deve ser entre 5-120 anos"
-    except ValueError:
-        return "Digite um número válido"
-    return None
-
-def validar_senha(senha: str) -> Optional[str]:
-    if len(senha) < 8:
-        return "Mínimo 8 caracteres"
-    if not any(c.isupper() for c in senha):
-        return "Pelo menos 1 letra maiúscula"
-    if not any(c.isdigit() for c in senha):
-        return "Pelo menos 1 número"
-    if not any(c in "!@#$%&*_-+=" for c in senha):
-        return "Pelo menos 1 símbolo especial"
-    return None
-
-def validar_nome_usuario(nome: str) -> Optional[str]:
-    if not re.match(r'^[a-zA-Z0-9_]{4,20}$', nome):
-        return "4-20 caracteres (letras, números e _)"
-    return None
+sessao_atual: Optional[str] = None  # Token da sessão aberta neste terminal
+_indices = IndicesUsuarios()
+_indices_prontos = False
 
 # ========== OPERAÇÕES DE USUÁRIO ==========
 def criar_usuario(is_admin: bool = False):
@@ -117,6 +240,8 @@ def criar_usuario(is_admin: bool = False):
         email = input("Email: ").strip()
         if erro := validar_email(email):
             print(f"{COR_ERRO}❌ {erro}{RESET_COR}")
+        elif buscar_por_email(email):
+            print(f"{COR_ERRO}⚠️ Email já cadastrado!{RESET_COR}")
         else:
             break
 
@@ -139,34 +264,67 @@ def criar_usuario(is_admin: bool = False):
 
     # Salva dados
     usuarios_cadastrados[nome] = {
-        "senha": senha,
+        "senha": gerar_hash(senha),
         "email": email,
         "idade": idade_int,
         "is_admin": is_admin,
         "data_cadastro": datetime.now().isoformat(),
         "cursos": [],               # Lista de IDs de cursos matriculados
         "certificados": [],         # Lista de certificados emitidos
-        "modulos_concluidos": {},   # {"id_curso": [lista_de_modulos]}
+        "modulos_concluidos": {},   # {"id_curso": [ids_dos_modulos]}
         "ultimo_acesso": None       # Novo campo para rastreamento
     }
-    salvar_usuarios()
-    registrar_log(f"Cadastro de {tipo}", f"Usuário: {nome}")
+    salvar_usuarios(nome)
+    registrar_log(f"Cadastro de {tipo}", f"Usuário: {nome}", alvo=nome)
     print(f"{COR_SUCESSO}✅ {tipo} registrado!{RESET_COR}")
 
+def autenticar(nome: str, senha: str, origem: Optional[str] = None) -> Tuple[Optional[str], Optional[float]]:
+    """Valida as credenciais e abre uma sessão.
+
+    Devolve (token, None) no acerto, (None, None) em credenciais inválidas e
+    (None, segundos de espera) quando o limitador recusou a tentativa.
+    """
+    # Recusa excesso de tentativas antes de qualquer leitura do disco (única ficha consumida)
+    if (espera := limitador_login.verificar(nome)) is not None:
+        return None, espera
+
+    recarregar_usuarios()  # Só relê o arquivo se outro processo gravou
+    existe = nome in usuarios_cadastrados
+    armazenada = usuarios_cadastrados[nome]["senha"] if existe else hash_ficticio()
+    sucesso = verificar_senha(senha, armazenada) and existe  # Mesmo custo com ou sem usuário
+    limitador_login.registrar_resultado(nome, sucesso)
+    if sucesso:
+        if precisa_rehash(usuarios_cadastrados[nome]["senha"]):
+            # Senha antiga (texto puro ou parâmetros desatualizados): regrava com os parâmetros atuais
+            usuarios_cadastrados[nome]["senha"] = gerar_hash(senha)
+        usuarios_cadastrados[nome]["ultimo_acesso"] = datetime.now().isoformat()
+        salvar_usuarios(nome)
+    origem = origem or origem_sessao()
+    for alerta in detector_acessos.registrar_tentativa(nome, origem, sucesso):
+        registrar_log("Acesso suspeito", f"{alerta['tipo']}: {alerta['detalhes']}", alvo=nome)
+
+    if not sucesso:
+        registrar_log("Login falhou", f"Usuário: {nome} | Origem: {origem}", alvo=nome)
+        return None, None
+    sessao = gerenciador_sessoes.criar(nome, usuarios_cadastrados[nome]["is_admin"], origem)
+    registrar_log("Login realizado", f"Usuário: {nome} | Origem: {origem}", alvo=nome, sessao=sessao["token"])
+    return sessao["token"], None
+
 def fazer_login() -> bool:
-    global usuario_logado, usuarios_cadastrados  # Adiciona a variável global
-    usuarios_cadastrados = carregar_usuarios()  # Recarrega antes de validar
+    global sessao_atual
     
     print(f"\n{COR_ADM}=== LOGIN ===")
     nome = input("Usuário: ").strip()
     senha = input("Senha: ")
 
-    if nome in usuarios_cadastrados and usuarios_cadastrados[nome]["senha"] == senha:
-        usuario_logado = {
-            "nome": nome,
-            "is_admin": usuarios_cadastrados[nome]["is_admin"]
-        }
-        registrar_log("Login realizado", f"Usuário: {nome}")
+    token, espera = autenticar(nome, senha)
+    if espera is not None:
+        print(f"{COR_ERRO}⏳ Muitas tentativas! Tente novamente em {int(espera) + 1}s{RESET_COR}")
+        return False
+    if token:
+        if sessao_atual:
+            gerenciador_sessoes.encerrar(sessao_atual)
+        sessao_atual = token
         print(f"\n{COR_SUCESSO}✅ Login bem-sucedido!{RESET_COR}")
         return True
     
@@ -174,17 +332,16 @@ def fazer_login() -> bool:
     return False
 
 # ========== GERENCIAMENTO DE CONTAS ==========
-def deletar_conta():
+def deletar_conta(sessao: Optional[str] = None):
     """Permite auto-deleção de contas não-administrativas"""
-    global usuario_logado, usuarios_cadastrados
-    
-    if not usuario_logado:
+    logado = get_usuario_logado(sessao)
+    if not logado:
         print(f"{COR_ERRO}⚠️ Nenhum usuário logado!{RESET_COR}")
         return
     
-    nome = usuario_logado['nome']
+    nome = logado['nome']
     
-    if eh_admin():
+    if eh_admin(sessao):
         print(f"{COR_ADM}⚠️ ADMs devem usar o menu administrativo{RESET_COR}")
         return
     
@@ -195,15 +352,16 @@ def deletar_conta():
     confirmacao = input("\nDigite 'DELETAR' para confirmar: ")
     if confirmacao == 'DELETAR':
         usuarios_cadastrados.pop(nome)
-        salvar_usuarios()
-        registrar_log("Usuário: {nome}")
-        logout()
+        salvar_usuarios(nome)
+        registrar_log("Conta deletada", f"Usuário: {nome}", alvo=nome, sessao=sessao)
+        logout(sessao)
+        gerenciador_sessoes.encerrar_do_usuario(nome)  # Outras sessões abertas da conta
         print(f"{COR_SUCESSO}✅ Conta removida!{RESET_COR}")
     else:
         print(f"{COR_USUARIO}❌ Cancelado{RESET_COR}")
 
 # ========== MENU ADMINISTRATIVO ==========
-def menu_admin():
+def menu_admin(sessao: Optional[str] = None):
     """Painel completo para administradores"""
     while True:
         print(f"\n{COR_ADM}=== MENU ADMIN ===")
@@ -213,7 +371,10 @@ def menu_admin():
         print("4. 🔍 VER DADOS COMPLETOS")
         print("5. 🗑️ DELETAR USUÁRIO")
         print("6. 📜 VER REGISTROS DE LOG")
-        print("7. ↩ VOLTAR")
+        print("7. 📥 IMPORTAR USUÁRIOS (CSV/JSONL)")
+        print("8. 📤 EXPORTAR DADOS (CSV/JSONL)")
+        print("9. 🧮 OPERAÇÕES EM LOTE")
+        print("10. ↩ VOLTAR")
         print("="*25 + RESET_COR)
         
         escolha = input("Escolha: ")
@@ -223,29 +384,40 @@ def menu_admin():
         elif escolha == '2':
             criar_usuario(is_admin=False)
         elif escolha == '3':
-            listar_usuarios()
+            listar_usuarios(sessao)
         elif escolha == '4':
-            visualizar_dados_completos()
+            visualizar_dados_completos(sessao)
         elif escolha == '5':
-            deletar_usuario_admin()
+            deletar_usuario_admin(sessao)
         elif escolha == '6':
-            visualizar_logs()
+            visualizar_logs(sessao)
         elif escolha == '7':
+            from usuarios.importacao import tela_importacao
+            tela_importacao(sessao)
+        elif escolha == '8':
+            from usuarios.exportacao import tela_exportacao
+            tela_exportacao(sessao)
+        elif escolha == '9':
+            from usuarios.lote import tela_operacoes_lote
+            tela_operacoes_lote(sessao)
+        elif escolha == '10':
             break
         else:
             print(f"{COR_ERRO}❌ Opção inválida!{RESET_COR}")
 
-def deletar_usuario_admin():
+def deletar_usuario_admin(sessao: Optional[str] = None):
     """Deleção de usuários por ADMs"""
+    if not eh_admin(sessao):
+        print(f"{COR_ERRO}⚠️ Acesso restrito!{RESET_COR}")
+        return
+    logado = get_usuario_logado(sessao)
+
     print(f"\n{COR_ADM}=== DELETAR USUÁRIO ===")
-    listar_usuarios()
-    nome = input("\nNome do usuário a deletar: ").strip()
-    
-    if nome not in usuarios_cadastrados:
-        print(f"{COR_ERRO}⚠️ Usuário não encontrado!{RESET_COR}")
+    nome = escolher_usuario("Usuário a deletar")
+    if nome is None:
         return
     
-    if nome == usuario_logado['nome']:
+    if nome == logado['nome']:
         print(f"{COR_ADM}⚠️ Use a opção de deletar conta no menu principal{RESET_COR}")
         return
     
@@ -257,62 +429,154 @@ def deletar_usuario_admin():
     confirmacao = input("\nConfirmar deleção? (S/N): ").upper()
     if confirmacao == 'S':
         usuarios_cadastrados.pop(nome)
-        salvar_usuarios()
-        ("Usuário deletado por ADM", f"Usuário: {nome} | Por: {usuario_logado['nome']}")
+        salvar_usuarios(nome)
+        gerenciador_sessoes.encerrar_do_usuario(nome)
+        registrar_log("Usuário deletado por ADM", f"Usuário: {nome} | Por: {logado['nome']}", alvo=nome, sessao=sessao)
         print(f"{COR_SUCESSO}✅ Usuário removido!{RESET_COR}")
 
-def visualizar_logs():
+def visualizar_logs(sessao: Optional[str] = None):
     """Exibe os registros de log"""
-    if not eh_admin():
+    if not eh_admin(sessao):
         print(f"{COR_ERRO}⚠️ Acesso restrito!{RESET_COR}")
         return
     
-    print(f"\n{COR_LOG}=== ÚLTIMOS REGISTROS ===")
-    try:
-        with open(ARQUIVO_LOG, 'r') as f:
-            print(f.read())
-    except FileNotFoundError:
+    print(f"\n{COR_LOG}=== ÚLTIMOS REGISTROS (mais recentes primeiro) ===")
+    descarregar_logs()
+    if not os.path.exists(ARQUIVO_LOG):
         print("Nenhum registro encontrado")
+        print("="*50 + RESET_COR)
+        return
+
+    # Lê do fim do arquivo, uma página por vez: a memória não depende do tamanho do log
+    entradas = entradas_do_fim(ARQUIVO_LOG)
+    while True:
+        pagina = list(islice(entradas, TAMANHO_PAGINA_LOG))
+        for entrada in pagina:
+            print(entrada)
+        if len(pagina) < TAMANHO_PAGINA_LOG:
+            print("— Início do log —")
+
+        opcao = input(f"{RESET_COR}[Enter] Mais antigos | [A] Acompanhar novos | [0] Sair: {COR_LOG}").strip().upper()
+        if opcao == 'A':
+            print("Acompanhando o log... (Ctrl+C para parar)")
+            try:
+                for linha in acompanhar_log(ARQUIVO_LOG):
+                    print(linha)
+            except KeyboardInterrupt:
+                pass
+            break
+        if opcao == '0' or len(pagina) < TAMANHO_PAGINA_LOG:
+            break
     print("="*50 + RESET_COR)
 
 # ========== FUNÇÕES AUXILIARES ==========
-def listar_usuarios():
-    """Listagem resumida de usuários"""
-    if not eh_admin():
+def escolher_usuario(titulo: str = "Usuário") -> Optional[str]:
+    """Seleciona um usuário digitando o início do nome (com sugestões se houver erro de digitação)"""
+    while True:
+        termo = input(f"\n{titulo} (nome ou início do nome, Enter cancela): ").strip()
+        if not termo:
+            return None
+        recarregar_usuarios()
+        if termo in usuarios_cadastrados:
+            return termo
+
+        opcoes = buscar_por_prefixo(termo)
+        if not opcoes and (opcoes := buscar_aproximado(termo)):
+            print(f"{COR_ERRO}Nenhum nome começa com '{termo}'. Você quis dizer:{RESET_COR}")
+        if not opcoes:
+            print(f"{COR_ERRO}⚠️ Usuário não encontrado!{RESET_COR}")
+            continue
+
+        for i, nome in enumerate(opcoes, 1):
+            dados = usuarios_cadastrados[nome]
+            tipo = f"{COR_ADM}ADMIN{RESET_COR}" if dados["is_admin"] else f"{COR_USUARIO}ALUNO{RESET_COR}"
+            print(f"{i}. {nome} ({tipo}) | Email: {dados['email']}")
+        if len(opcoes) == LIMITE_SUGESTOES:
+            print("... digite mais letras para refinar")
+        escolha = input("Número (Enter para buscar de novo): ").strip()
+        if escolha.isdigit() and 1 <= int(escolha) <= len(opcoes):
+            return opcoes[int(escolha) - 1]
+
+def pedir_filtros_usuarios() -> Dict:
+    """Pergunta os filtros da listagem (em branco = sem filtro)"""
+    filtros = {}
+    perfil = input("Perfil [A]dmin / A[L]uno: ").strip().upper()
+    if perfil in ('A', 'L'):
+        filtros["perfil"] = perfil == 'A'
+    for chave, pergunta in (("dominio", "Domínio do email (ex: escola.com): "),
+                            ("curso", "ID do curso matriculado: "),
+                            ("desde", "Cadastro desde (AAAA-MM-DD): "),
+                            ("ate", "Cadastro até (AAAA-MM-DD): "),
+                            ("sem_acesso_desde", "Sem acesso desde (AAAA-MM-DD): ")):
+        if valor := input(pergunta).strip():
+            filtros[chave] = valor
+    if input("Ordenar por [N]ome / [D]ata de cadastro: ").strip().upper() == 'D':
+        filtros["ordenar"] = "cadastro"
+    return filtros
+
+def listar_usuarios(sessao: Optional[str] = None, **filtros):
+    """Listagem resumida de usuários, uma página por vez"""
+    if not eh_admin(sessao):
         print(f"{COR_ERRO}⚠️ Acesso restrito!{RESET_COR}")
         return
     
     print(f"\n{COR_ADM}=== USUÁRIOS ===")
-    for usuario, dados in usuarios_cadastrados.items():
-        tipo = f"{COR_ADM}ADMIN{RESET_COR}" if dados["is_admin"] else f"{COR_USUARIO}ALUNO{RESET_COR}"
-        print(f"- {usuario} ({tipo}) | Email: {dados['email']}")
+    cursor = None
+    while True:
+        pagina, cursor = pagina_usuarios(cursor=cursor, **filtros)
+        for usuario, dados in pagina:
+            tipo = f"{COR_ADM}ADMIN{RESET_COR}" if dados["is_admin"] else f"{COR_USUARIO}ALUNO{RESET_COR}"
+            print(f"- {usuario} ({tipo}) | Email: {dados['email']} | Cadastro: {(dados.get('data_cadastro') or '')[:10]}")
+        if cursor is None:
+            break
+        opcao = input(f"[Enter] Próxima página | [F] Filtrar | [0] Parar: {COR_ADM}").strip().upper()
+        if opcao == 'F':
+            filtros = pedir_filtros_usuarios()
+            cursor = None
+        elif opcao == '0':
+            break
     print("="*25 + RESET_COR)
 
-def visualizar_dados_completos():
-    """Exibe todos os dados do JSON"""
-    if not eh_admin():
+def visualizar_dados_completos(sessao: Optional[str] = None):
+    """Exibe todos os dados do JSON, um registro por vez"""
+    if not eh_admin(sessao):
         print(f"{COR_ERRO}⚠️ Acesso restrito!{RESET_COR}")
         return
     
     print(f"\n{COR_ADM}=== DADOS COMPLETOS ===")
-    print(json.dumps(usuarios_cadastrados, indent=4, ensure_ascii=False))
+    print("{")
+    # Serializa registro a registro: a memória não depende do total de usuários
+    for i, (nome, dados) in enumerate(usuarios_cadastrados.items(), 1):
+        registro = json.dumps(dados, indent=4, ensure_ascii=False).replace("\n", "\n    ")
+        print(f"    {json.dumps(nome, ensure_ascii=False)}: {registro},")
+        if i % TAMANHO_PAGINA_DADOS == 0:
+            if input(f"{RESET_COR}[Enter] Continuar | [0] Parar: {COR_ADM}").strip() == '0':
+                break
+    print("}")
     print("="*50 + RESET_COR)
 
-def eh_admin() -> bool:
-    return usuario_logado and usuario_logado["is_admin"]
+def eh_admin(sessao: Optional[str] = None) -> bool:
+    logado = get_usuario_logado(sessao)
+    return bool(logado and logado["is_admin"])
 
-def logout():
+def logout(sessao: Optional[str] = None):
     """Encerra a sessão com registro"""
-    global usuario_logado
-    if usuario_logado:
-        registrar_log("Logout", f"Usuário: {usuario_logado['nome']}")
-        print(f"\n{COR_ADM}👋 Até logo, {usuario_logado['nome']}!{RESET_COR}")
-        usuario_logado = None
+    global sessao_atual
+    token = sessao or sessao_atual
+    logado = get_usuario_logado(token)
+    if logado:
+        registrar_log("Logout", f"Usuário: {logado['nome']}", alvo=logado['nome'], sessao=token)
+        print(f"\n{COR_ADM}👋 Até logo, {logado['nome']}!{RESET_COR}")
+    if token:
+        gerenciador_sessoes.encerrar(token)
+    if token == sessao_atual:
+        sessao_atual = None
 
 # ========== INTERFACE PRINCIPAL ==========
 def tela_login_cadastro():
     """Tela adaptável ao status de login"""
     while True:
+        usuario_logado = get_usuario_logado()
         print(f"\n{COR_USUARIO}=== {'LOGOUT' if usuario_logado else 'LOGIN'} / CADASTRO ===")
         print(f"1. {'🔓 DESLOGAR' if usuario_logado else '🔑 ENTRAR'}")
         print("2. 📝 CADASTRAR-SE")
@@ -351,8 +615,9 @@ def tela_login_cadastro():
         else:
             print(f"{COR_ERRO}❌ Opção inválida!{RESET_COR}")
 
-def mostrar_meus_dados():
+def mostrar_meus_dados(sessao: Optional[str] = None):
     """Exibe dados do usuário logado"""
+    usuario_logado = get_usuario_logado(sessao)
     if not usuario_logado:
         print(f"{COR_ERRO}⚠️ Nenhum usuário logado!{RESET_COR}")
         return
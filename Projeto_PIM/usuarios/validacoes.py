@@ -0,0 +1,34 @@
+import re
+from typing import Optional
+
+
+# ========== VALIDAÇÕES ==========
+# Sem dependências do resto do sistema: processos de trabalho importam só este arquivo
+def validar_email(email: str) -> Optional[str]:
+    if not re.match(r'^[\w\.-]+@[\w\.-]+\.\w+$', email):
+        return "Email inválido! Formato: usuario@dominio.com"
+    return None
+
+def validar_idade(idade: str) -> Optional[str]:
+    try:
+        if not 5 <= int(idade) <= 120:
+            return "Idade deve ser entre 5-120 anos"
+    except ValueError:
+        return "Digite um número válido"
+    return None
+
+def validar_senha(senha: str) -> Optional[str]:
+    if len(senha) < 8:
+        return "Mínimo 8 caracteres"
+    if not any(c.isupper() for c in senha):
+        return "Pelo menos 1 letra maiúscula"
+    if not any(c.isdigit() for c in senha):
+        return "Pelo menos 1 número"
+    if not any(c in "!@#$%&*_-+=" for c in senha):
+        return "Pelo menos 1 símbolo especial"
+    return None
+
+def validar_nome_usuario(nome: str) -> Optional[str]:
+    if not re.match(r'^[a-zA-Z0-9_]{4,20}$', nome):
+        return "4-20 caracteres (letras, números e _)"
+    return None